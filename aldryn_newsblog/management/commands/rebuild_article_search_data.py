@@ -1,13 +1,64 @@
 # -*- coding: utf-8 -*-
+import time
+from datetime import datetime
+from multiprocessing import Pool
+
 from django.conf import settings
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_date, parse_datetime
 
+from parler.cache import _delete_cached_translation
 from parler.utils.context import switch_language
 
 from aldryn_newsblog.models import Article
 
 
+def close_connections():
+    # forked workers must not share the parent's database connections
+    connections.close_all()
+
+
+def render_search_data(args):
+    """
+    Renders the search data of the given articles' translations, returns the
+    changed translations as (pk, master_id, language_code, search_data) and
+    the number of translations rendered.
+    """
+    article_ids, languages = args
+
+    # ArticleTranslation
+    translation_model = Article._parler_meta.root_model
+
+    articles = Article.objects.filter(pk__in=article_ids).prefetch_related(
+        'translations', 'categories__translations', 'tags')
+    changed = []
+    rendered = 0
+    for article in articles:
+        translations = [
+            translation for translation in article.translations.all()
+            if translation.language_code in languages]
+
+        # set internal parler cache
+        # to avoid parler hitting db for every language
+        article._translations_cache[translation_model] = dict(
+            (trans.language_code, trans) for trans in translations)
+
+        for translation in translations:
+            language = translation.language_code
+
+            with switch_language(article, language_code=language):
+                search_data = article.get_search_data()
+            rendered += 1
+            if search_data != translation.search_data:
+                changed.append((
+                    translation.pk, article.pk, language, search_data))
+    return changed, rendered
+
+
 class Command(BaseCommand):
+    help = 'Rebuilds the search data of the published articles.'
     can_import_settings = True
 
     def add_arguments(self, parser):
@@ -18,6 +69,66 @@ class Command(BaseCommand):
             dest='languages',
             default=None,
             )
+        parser.add_argument(
+            '--changed-since',
+            dest='changed_since',
+            default=None,
+            help='Only rebuild articles published or whose content plugins '
+                 'changed since this date (YYYY-MM-DD[ HH:MM[:SS]]).',
+            )
+        parser.add_argument(
+            '--chunk-size',
+            dest='chunk_size',
+            type=int,
+            default=100,
+            help='Number of articles rendered and written at once.',
+            )
+        parser.add_argument(
+            '--processes',
+            dest='processes',
+            type=int,
+            default=1,
+            help='Number of processes rendering the plugins.',
+            )
+
+    def get_changed_since(self, value):
+        if value is None:
+            return None
+        changed_since = parse_datetime(value)
+        if changed_since is None:
+            date = parse_date(value)
+            if date is None:
+                raise CommandError(
+                    'Invalid --changed-since date: {0}'.format(value))
+            changed_since = datetime(date.year, date.month, date.day)
+        return changed_since
+
+    def get_article_ids(self, changed_since):
+        articles = Article.objects.published()
+        if changed_since is not None:
+            articles = articles.filter(
+                Q(publishing_date__gte=changed_since) |  # noqa: W504
+                Q(content__cmsplugin__changed_date__gte=changed_since))
+        return list(
+            articles.order_by('pk').values_list('pk', flat=True).distinct())
+
+    def get_chunks(self, article_ids, chunk_size, languages):
+        for start in range(0, len(article_ids), chunk_size):
+            yield article_ids[start:start + chunk_size], languages
+
+    def save_search_data(self, changed):
+        # ArticleTranslation
+        translation_model = Article._parler_meta.root_model
+
+        translations = [
+            translation_model(
+                pk=pk, master_id=master_id, language_code=language_code,
+                search_data=search_data)
+            for pk, master_id, language_code, search_data in changed]
+        # make sure to only update the search_data field
+        translation_model.objects.bulk_update(translations, ['search_data'])
+        for translation in translations:
+            _delete_cached_translation(translation)
 
     def handle(self, *args, **options):
         languages = options.get('languages')
@@ -25,26 +136,42 @@ class Command(BaseCommand):
         if languages is None:
             languages = [language[0] for language in settings.LANGUAGES]
 
-        # ArticleTranslation
-        translation_model = Article._parler_meta.root_model
-
-        for article in Article.objects.published():
-            translations = article.translations.filter(
-                language_code__in=languages
-                )
+        changed_since = self.get_changed_since(options.get('changed_since'))
+        chunk_size = max(options.get('chunk_size') or 100, 1)
+        processes = max(options.get('processes') or 1, 1)
 
-            # build internal parler cache
-            parler_cache = dict(
-                (trans.language_code, trans) for trans in translations)
+        article_ids = self.get_article_ids(changed_since)
+        chunks = self.get_chunks(article_ids, chunk_size, languages)
 
-            # set internal parler cache
-            # to avoid parler hitting db for every language
-            article._translations_cache[translation_model] = parler_cache
+        pool = None
+        if processes > 1:
+            close_connections()
+            pool = Pool(processes, initializer=close_connections)
+            results = pool.imap(render_search_data, chunks)
+        else:
+            results = (render_search_data(chunk) for chunk in chunks)
 
-            for translation in translations:
-                language = translation.language_code
+        started = time.time()
+        done = rendered = updated = 0
+        try:
+            for changed, chunk_rendered in results:
+                if changed:
+                    self.save_search_data(changed)
+                done = min(done + chunk_size, len(article_ids))
+                rendered += chunk_rendered
+                updated += len(changed)
+                elapsed = max(time.time() - started, 0.001)
+                self.stdout.write(
+                    '{0}/{1} articles, {2} translations rendered, {3} updated '
+                    '({4:.1f} articles/s)'.format(
+                        done, len(article_ids), rendered, updated,
+                        done / elapsed))
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
 
-                with switch_language(article, language_code=language):
-                    translation.search_data = article.get_search_data()
-                    # make sure to only update the search_data field
-                    translation.save(update_fields=["search_data"])
+        self.stdout.write(
+            'Rebuilt the search data of {0} articles: {1} translations '
+            'updated, {2} unchanged.'.format(
+                len(article_ids), updated, rendered - updated))
@@ -3,10 +3,11 @@
 from __future__ import unicode_literals
 
 import datetime
-from collections import Counter
 from operator import attrgetter
 
 from django.db import models
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
 from django.utils.timezone import now
 
 from aldryn_apphooks_config.managers.base import ManagerMixin, QuerySetMixin
@@ -15,6 +16,7 @@ from parler.managers import TranslatableManager, TranslatableQuerySet
 from taggit.models import Tag, TaggedItem
 
 from aldryn_newsblog.compat import toolbar_edit_mode_active
+from aldryn_newsblog.utils import get_cached_aggregate
 
 
 class ArticleQuerySet(QuerySetMixin, TranslatableQuerySet):
@@ -53,26 +55,32 @@ class RelatedManager(ManagerMixin, TranslatableManager):
         ]
         """
 
-        # TODO: check if this limitation still exists in Django 1.6+
-        # This is done in a naive way as Django is having tough time while
-        # aggregating on date fields
-        if (request and hasattr(request, 'toolbar') and  # noqa: #W504
-                request.toolbar and toolbar_edit_mode_active(request)):
+        edit_mode = (
+            request and hasattr(request, 'toolbar') and  # noqa: #W504
+            request.toolbar and toolbar_edit_mode_active(request))
+        if edit_mode:
             articles = self.namespace(namespace)
         else:
             articles = self.published().namespace(namespace)
-        dates = articles.values_list('publishing_date', flat=True)
-        dates = [(x.year, x.month) for x in dates]
-        date_counter = Counter(dates)
-        dates = set(dates)
-        dates = sorted(dates, reverse=True)
-        months = [
-            # Use day=3 to make sure timezone won't affect this hacks'
-            # month value. There are UTC+14 and UTC-12 timezones!
-            {'date': datetime.date(year=year, month=month, day=3),
-             'num_articles': date_counter[(year, month)]}
-            for year, month in dates]
-        return months
+        # Months are counted in UTC, like the publishing dates are stored.
+        months = articles.annotate(
+            month=TruncMonth('publishing_date', tzinfo=timezone.utc)
+            ).order_by().values('month').annotate(
+            num_articles=models.Count('pk')
+            ).order_by('-month').values_list('month', 'num_articles')
+
+        def count_months():
+            for month, num_articles in months:
+                # Use day=3 to make sure timezone won't affect this hacks'
+                # month value. There are UTC+14 and UTC-12 timezones!
+                yield {
+                    'date': datetime.date(
+                        year=month.year, month=month.month, day=3),
+                    'num_articles': num_articles,
+                    }
+
+        return get_cached_aggregate(
+            namespace, 'months', edit_mode, count_months)
 
     def get_authors(self, namespace):
         """
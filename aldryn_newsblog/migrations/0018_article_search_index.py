@@ -0,0 +1,84 @@
+from django.db import migrations
+from django.db.utils import OperationalError
+
+
+FORWARD_SQL = {
+    'mysql': [
+        'CREATE FULLTEXT INDEX aldryn_newsblog_article_translation_fts '
+        'ON aldryn_newsblog_article_translation (title, lead_in, search_data)',
+        ],
+    'postgresql': [
+        "CREATE INDEX aldryn_newsblog_article_translation_fts "
+        "ON aldryn_newsblog_article_translation USING GIN (to_tsvector('simple', "
+        "coalesce(title, '') || ' ' || coalesce(lead_in, '') || ' ' || "
+        "coalesce(search_data, '')))",
+        ],
+    'sqlite': [
+        "CREATE VIRTUAL TABLE aldryn_newsblog_article_translation_fts USING fts5("
+        "title, lead_in, search_data, content='aldryn_newsblog_article_translation', "
+        "content_rowid='id')",
+        "CREATE TRIGGER aldryn_newsblog_article_translation_fts_insert "
+        "AFTER INSERT ON aldryn_newsblog_article_translation BEGIN "
+        "INSERT INTO aldryn_newsblog_article_translation_fts"
+        "(rowid, title, lead_in, search_data) "
+        "VALUES (new.id, new.title, new.lead_in, new.search_data); END",
+        "CREATE TRIGGER aldryn_newsblog_article_translation_fts_delete "
+        "AFTER DELETE ON aldryn_newsblog_article_translation BEGIN "
+        "INSERT INTO aldryn_newsblog_article_translation_fts"
+        "(aldryn_newsblog_article_translation_fts, rowid, title, lead_in, search_data) "
+        "VALUES ('delete', old.id, old.title, old.lead_in, old.search_data); END",
+        "CREATE TRIGGER aldryn_newsblog_article_translation_fts_update "
+        "AFTER UPDATE ON aldryn_newsblog_article_translation BEGIN "
+        "INSERT INTO aldryn_newsblog_article_translation_fts"
+        "(aldryn_newsblog_article_translation_fts, rowid, title, lead_in, search_data) "
+        "VALUES ('delete', old.id, old.title, old.lead_in, old.search_data); "
+        "INSERT INTO aldryn_newsblog_article_translation_fts"
+        "(rowid, title, lead_in, search_data) "
+        "VALUES (new.id, new.title, new.lead_in, new.search_data); END",
+        "INSERT INTO aldryn_newsblog_article_translation_fts"
+        "(aldryn_newsblog_article_translation_fts) VALUES ('rebuild')",
+        ],
+    }
+
+REVERSE_SQL = {
+    'mysql': [
+        'DROP INDEX aldryn_newsblog_article_translation_fts '
+        'ON aldryn_newsblog_article_translation',
+        ],
+    'postgresql': [
+        'DROP INDEX IF EXISTS aldryn_newsblog_article_translation_fts',
+        ],
+    'sqlite': [
+        'DROP TRIGGER IF EXISTS aldryn_newsblog_article_translation_fts_insert',
+        'DROP TRIGGER IF EXISTS aldryn_newsblog_article_translation_fts_delete',
+        'DROP TRIGGER IF EXISTS aldryn_newsblog_article_translation_fts_update',
+        'DROP TABLE IF EXISTS aldryn_newsblog_article_translation_fts',
+        ],
+    }
+
+
+def run_sql(statements):
+    def run(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+def create_search_index(apps, schema_editor):
+    try:
+        run_sql(FORWARD_SQL)(apps, schema_editor)
+    except OperationalError:
+        # SQLite built without FTS5, searches fall back to LIKE
+        if schema_editor.connection.vendor != 'sqlite':
+            raise
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aldryn_newsblog', '0017_auto_20200624_0802'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, run_sql(REVERSE_SQL)),
+    ]
@@ -4,10 +4,9 @@ from __future__ import unicode_literals
 
 import django.core.validators
 from django.conf import settings
-from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ImproperlyConfigured
-from django.db import connection, models
-from django.db.models.signals import post_save
+from django.db import models
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from django.urls import reverse
 from django.utils.encoding import force_text
@@ -30,6 +29,7 @@ from aldryn_translation_tools.models import (
 from djangocms_text_ckeditor.fields import HTMLField
 from filer.fields.image import FilerImageField
 from parler.models import TranslatableModel, TranslatedFields
+from parler.utils.context import switch_language
 from sortedm2m.fields import SortedManyToManyField
 from taggit.managers import TaggableManager
 from taggit.models import Tag
@@ -39,7 +39,10 @@ from aldryn_newsblog.utils.utilities import get_valid_languages_from_request
 
 from .cms_appconfig import NewsBlogConfig
 from .managers import RelatedManager
-from .utils import get_plugin_index_data, get_request, strip_tags
+from .utils import (
+    get_cached_aggregate, get_plugin_index_data, get_request,
+    invalidate_aggregates, strip_tags,
+    )
 
 
 if settings.LANGUAGES:
@@ -51,19 +54,6 @@ else:
         'Neither LANGUAGES nor LANGUAGE was found in settings.')
 
 
-# At startup time, SQL_NOW_FUNC will contain the database-appropriate SQL to
-# obtain the CURRENT_TIMESTAMP.
-SQL_NOW_FUNC = {
-    'mssql': 'GetDate()', 'mysql': 'NOW()', 'postgresql': 'now()',
-    'sqlite': 'CURRENT_TIMESTAMP', 'oracle': 'CURRENT_TIMESTAMP'
-    }[connection.vendor]
-
-SQL_IS_TRUE = {
-    'mssql': '== TRUE', 'mysql': '= 1', 'postgresql': 'IS TRUE',
-    'sqlite': '== 1', 'oracle': 'IS TRUE'
-    }[connection.vendor]
-
-
 @python_2_unicode_compatible
 class Article(TranslatedAutoSlugifyMixin,
               TranslationHelperMixin,
@@ -239,11 +229,22 @@ class Article(TranslatedAutoSlugifyMixin,
                 text_bits.append(plugin_text_content)
         return ' '.join(text_bits)
 
-    def save(self, *args, **kwargs):
-        # Update the search index
-        if self.update_search_on_save:
-            self.search_data = self.get_search_data()
+    def refresh_search_data(self, language=None):
+        """
+        Recomputes the search data of the given translation, or of all
+        translations. Projects may override this to defer the work.
+        """
+        if language is None:
+            languages = self.get_available_languages()
+        else:
+            languages = [language]
+        for language in languages:
+            translation = self._get_translated_model(language)
+            with switch_language(self, language):
+                translation.search_data = self.get_search_data(language)
+            translation.save(update_fields=['search_data'])
 
+    def save(self, *args, **kwargs):
         # Ensure there is an owner.
         if self.app_config.create_authors and self.author is None:
             self.author = Person.objects.get_or_create(
@@ -257,10 +258,31 @@ class Article(TranslatedAutoSlugifyMixin,
         # slug would be generated by TranslatedAutoSlugifyMixin
         super(Article, self).save(*args, **kwargs)
 
+        # Update the search index
+        if self.update_search_on_save:
+            self.refresh_search_data(self.get_current_language())
+
     def __str__(self):
         return self.safe_translation_getter('title', any_language=True)
 
 
+def get_article_counts(queryset, app_config, edit_mode):
+    """
+    Annotates the people, categories or tags in queryset with the number of
+    articles (article_count) of the given section they are used by, leaving
+    out the unused ones. Outside of edit mode only published articles count.
+    """
+    articles = models.Q(article__app_config=app_config)
+    if not edit_mode:
+        articles &= models.Q(
+            article__is_published=True, article__publishing_date__lte=now())
+    queryset = queryset.filter(articles).annotate(
+        article_count=models.Count('article'))
+    if hasattr(queryset.model, 'translations'):
+        queryset = queryset.prefetch_related('translations')
+    return queryset.order_by('-article_count', 'pk')
+
+
 class PluginEditModeMixin(object):
     def get_edit_mode(self, request):
         """
@@ -336,38 +358,18 @@ class NewsBlogArticleSearchPlugin(NewsBlogCMSPlugin):
 class NewsBlogAuthorsPlugin(PluginEditModeMixin, NewsBlogCMSPlugin):
     def get_authors(self, request):
         """
-        Returns a queryset of authors (people who have published an article),
+        Returns a list of authors (people who have published an article),
         annotated by the number of articles (article_count) that are visible to
         the current user. If this user is anonymous, then this will be all
         articles that are published and whose publishing_date has passed. If the
         user is a logged-in cms operator, then it will be all articles.
         """
-
-        # The basic subquery (for logged-in content managers in edit mode)
-        subquery = """
-            SELECT COUNT(*)
-            FROM aldryn_newsblog_article
-            WHERE
-                aldryn_newsblog_article.author_id =
-                    aldryn_people_person.id AND
-                aldryn_newsblog_article.app_config_id = %d"""
-
-        # For other users, limit subquery to published articles
-        if not self.get_edit_mode(request):
-            subquery += """ AND
-                aldryn_newsblog_article.is_published %s AND
-                aldryn_newsblog_article.publishing_date <= %s
-            """ % (SQL_IS_TRUE, SQL_NOW_FUNC, )
-
-        # Now, use this subquery in the construction of the main query.
-        query = """
-            SELECT (%s) as article_count, aldryn_people_person.*
-            FROM aldryn_people_person
-        """ % (subquery % (self.app_config.pk, ), )
-
-        raw_authors = list(Person.objects.raw(query))
-        authors = [author for author in raw_authors if author.article_count]
-        return sorted(authors, key=lambda x: x.article_count, reverse=True)
+        edit_mode = self.get_edit_mode(request)
+        return get_cached_aggregate(
+            self.app_config.namespace, 'authors', edit_mode,
+            lambda: get_article_counts(
+                Person.objects.select_related('visual'),
+                self.app_config, edit_mode))
 
     def __str__(self):
         return ugettext('%s authors') % (self.app_config.get_app_title(), )
@@ -386,33 +388,11 @@ class NewsBlogCategoriesPlugin(PluginEditModeMixin, NewsBlogCMSPlugin):
         publishing_date has passed. If the user is a logged-in cms operator,
         then it will be all articles.
         """
-
-        subquery = """
-            SELECT COUNT(*)
-            FROM aldryn_newsblog_article, aldryn_newsblog_article_categories
-            WHERE
-                aldryn_newsblog_article_categories.category_id =
-                    aldryn_categories_category.id AND
-                aldryn_newsblog_article_categories.article_id =
-                    aldryn_newsblog_article.id AND
-                aldryn_newsblog_article.app_config_id = %d
-        """ % (self.app_config.pk, )
-
-        if not self.get_edit_mode(request):
-            subquery += """ AND
-                aldryn_newsblog_article.is_published %s AND
-                aldryn_newsblog_article.publishing_date <= %s
-            """ % (SQL_IS_TRUE, SQL_NOW_FUNC, )
-
-        query = """
-            SELECT (%s) as article_count, aldryn_categories_category.*
-            FROM aldryn_categories_category
-        """ % (subquery, )
-
-        raw_categories = list(Category.objects.raw(query))
-        categories = [
-            category for category in raw_categories if category.article_count]
-        return sorted(categories, key=lambda x: x.article_count, reverse=True)
+        edit_mode = self.get_edit_mode(request)
+        return get_cached_aggregate(
+            self.app_config.namespace, 'categories', edit_mode,
+            lambda: get_article_counts(
+                Category.objects.all(), self.app_config, edit_mode))
 
 
 @python_2_unicode_compatible
@@ -531,38 +511,17 @@ class NewsBlogTagsPlugin(PluginEditModeMixin, NewsBlogCMSPlugin):
 
     def get_tags(self, request):
         """
-        Returns a queryset of tags, annotated by the number of articles
+        Returns a list of tags, annotated by the number of articles
         (article_count) that are visible to the current user. If this user is
         anonymous, then this will be all articles that are published and whose
         publishing_date has passed. If the user is a logged-in cms operator,
         then it will be all articles.
         """
-
-        article_content_type = ContentType.objects.get_for_model(Article)
-
-        subquery = """
-            SELECT COUNT(*)
-            FROM aldryn_newsblog_article, taggit_taggeditem
-            WHERE
-                taggit_taggeditem.tag_id = taggit_tag.id AND
-                taggit_taggeditem.content_type_id = %d AND
-                taggit_taggeditem.object_id = aldryn_newsblog_article.id AND
-                aldryn_newsblog_article.app_config_id = %d"""
-
-        if not self.get_edit_mode(request):
-            subquery += """ AND
-                aldryn_newsblog_article.is_published %s AND
-                aldryn_newsblog_article.publishing_date <= %s
-            """ % (SQL_IS_TRUE, SQL_NOW_FUNC, )
-
-        query = """
-            SELECT (%s) as article_count, taggit_tag.*
-            FROM taggit_tag
-        """ % (subquery % (article_content_type.id, self.app_config.pk), )
-
-        raw_tags = list(Tag.objects.raw(query))
-        tags = [tag for tag in raw_tags if tag.article_count]
-        return sorted(tags, key=lambda x: x.article_count, reverse=True)
+        edit_mode = self.get_edit_mode(request)
+        return get_cached_aggregate(
+            self.app_config.namespace, 'tags', edit_mode,
+            lambda: get_article_counts(
+                Tag.objects.all(), self.app_config, edit_mode))
 
     def __str__(self):
         return ugettext('%s tags') % (self.app_config.get_app_title(), )
@@ -584,5 +543,37 @@ def update_search_data(sender, instance, **kwargs):
             if placeholder._attached_model_cache == Article:
                 article = placeholder._attached_model_cache.objects.language(
                     instance.language).get(content=placeholder.pk)
-                article.search_data = article.get_search_data(instance.language)
-                article.save()
+                article.refresh_search_data(instance.language)
+
+
+@receiver(post_save, sender=Article,
+          dispatch_uid='article_invalidate_aggregates_on_save')
+@receiver(post_delete, sender=Article,
+          dispatch_uid='article_invalidate_aggregates_on_delete')
+def invalidate_article_aggregates(sender, instance, **kwargs):
+    """
+    Drops the cached authors, categories, tags and archive months of the
+    article's section.
+    """
+    invalidate_aggregates(instance.app_config.namespace)
+
+
+@receiver(m2m_changed, sender=Article.categories.through,
+          dispatch_uid='article_invalidate_aggregates_on_categories')
+@receiver(m2m_changed, sender=Article.tags.through,
+          dispatch_uid='article_invalidate_aggregates_on_tags')
+def invalidate_article_relation_aggregates(sender, instance, action, **kwargs):
+    """
+    Categories and tags are set after the article itself was saved, so drop
+    the section's aggregates again once they changed.
+    """
+    if not action.startswith('post_'):
+        return
+    if isinstance(instance, Article):
+        namespaces = [instance.app_config.namespace]
+    else:
+        namespaces = NewsBlogConfig.objects.filter(
+            article__pk__in=kwargs.get('pk_set') or []
+            ).values_list('namespace', flat=True).distinct()
+    for namespace in namespaces:
+        invalidate_aggregates(namespace)
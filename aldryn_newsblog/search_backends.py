@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.utils.module_loading import import_string
+
+from .models import Article
+
+
+# The most relevant articles a search returns at most.
+SEARCH_MAX_RESULTS = getattr(
+    settings, 'ALDRYN_NEWSBLOG_SEARCH_MAX_RESULTS', 500)
+
+# The full-text index is built by migration 0018 over these columns.
+SQLITE_FTS_TABLE = 'aldryn_newsblog_article_translation_fts'
+POSTGRESQL_DOCUMENT = (
+    "coalesce(t.title, '') || ' ' || coalesce(t.lead_in, '') || ' ' || "
+    "coalesce(t.search_data, '')"
+    )
+
+
+def get_search_terms(query):
+    """
+    Splits a user query into plain words, so that no operator syntax of the
+    full-text engines is passed through.
+    """
+    return re.findall(r'\w+', query or '', re.UNICODE)
+
+
+class SearchBackend(object):
+    """
+    Finds the articles matching a query. Backends using a full-text index
+    implement get_ranked_ids(), this base class filters with LIKE.
+    """
+
+    def search(self, queryset, query, languages, app_config):
+        """
+        Returns queryset limited to the articles matching query in any of
+        languages, the most relevant first.
+        """
+        terms = get_search_terms(query)
+        if not terms:
+            return queryset.none()
+        ranked_ids = self.get_ranked_ids(terms, languages, app_config)
+        if ranked_ids is None:
+            return self.filter(queryset, query)
+        if not ranked_ids:
+            return queryset.none()
+        position = Case(
+            *[When(pk=pk, then=Value(i)) for i, pk in enumerate(ranked_ids)],
+            output_field=IntegerField()
+            )
+        return queryset.filter(pk__in=ranked_ids).annotate(
+            search_position=position).order_by('search_position')
+
+    def filter(self, queryset, query):
+        return queryset.filter(
+            Q(translations__title__icontains=query) |  # noqa: #W504
+            Q(translations__lead_in__icontains=query) |  # noqa: #W504
+            Q(translations__search_data__icontains=query)
+            ).distinct()
+
+    def get_ranked_ids(self, terms, languages, app_config):
+        """
+        Returns the ids of the matching articles of the section, the most
+        relevant first, or None if there is no index to search.
+        """
+        return None
+
+    def fetch_ranked_ids(self, sql, params):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        ranked_ids = []
+        for master_id, score in rows:
+            # an article matching in several languages is listed once
+            if master_id not in ranked_ids:
+                ranked_ids.append(master_id)
+        return ranked_ids
+
+    def get_tables(self):
+        return (
+            connection.ops.quote_name(
+                Article._parler_meta.root_model._meta.db_table),
+            connection.ops.quote_name(Article._meta.db_table),
+            )
+
+
+class MySQLSearchBackend(SearchBackend):
+    """
+    Searches the FULLTEXT index of the article translations in boolean mode,
+    requiring every word as a prefix.
+    """
+
+    def get_ranked_ids(self, terms, languages, app_config):
+        match = (
+            'MATCH (t.title, t.lead_in, t.search_data) '
+            'AGAINST (%s IN BOOLEAN MODE)'
+            )
+        against = ' '.join('+{0}*'.format(term) for term in terms)
+        translations, articles = self.get_tables()
+        sql = (
+            'SELECT t.master_id, {match} AS score FROM {translations} t '
+            'INNER JOIN {articles} a ON a.id = t.master_id '
+            'WHERE a.app_config_id = %s AND t.language_code IN ({languages}) '
+            'AND {match} ORDER BY score DESC LIMIT %s'
+            ).format(
+            match=match, translations=translations, articles=articles,
+            languages=', '.join(['%s'] * len(languages)),
+            )
+        params = [against, app_config.pk] + list(languages) + [
+            against, SEARCH_MAX_RESULTS]
+        return self.fetch_ranked_ids(sql, params)
+
+
+class PostgreSQLSearchBackend(SearchBackend):
+    """
+    Searches the GIN indexed tsvector of the article translations, requiring
+    every word as a prefix.
+    """
+
+    def get_ranked_ids(self, terms, languages, app_config):
+        document = "to_tsvector('simple', {0})".format(POSTGRESQL_DOCUMENT)
+        tsquery = ' & '.join('{0}:*'.format(term) for term in terms)
+        translations, articles = self.get_tables()
+        sql = (
+            'SELECT t.master_id, '
+            "ts_rank({document}, to_tsquery('simple', %s)) AS score "
+            'FROM {translations} t '
+            'INNER JOIN {articles} a ON a.id = t.master_id '
+            'WHERE a.app_config_id = %s AND t.language_code IN ({languages}) '
+            "AND {document} @@ to_tsquery('simple', %s) "
+            'ORDER BY score DESC LIMIT %s'
+            ).format(
+            document=document, translations=translations, articles=articles,
+            languages=', '.join(['%s'] * len(languages)),
+            )
+        params = [tsquery, app_config.pk] + list(languages) + [
+            tsquery, SEARCH_MAX_RESULTS]
+        return self.fetch_ranked_ids(sql, params)
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """
+    Searches the FTS5 table mirroring the article translations, requiring
+    every word as a prefix. Falls back to LIKE if SQLite was built without
+    FTS5 and the table could not be created.
+    """
+
+    def get_ranked_ids(self, terms, languages, app_config):
+        if SQLITE_FTS_TABLE not in connection.introspection.table_names():
+            return None
+        fts_query = ' '.join('"{0}"*'.format(term) for term in terms)
+        translations, articles = self.get_tables()
+        sql = (
+            'SELECT t.master_id, -bm25({fts}) AS score FROM {fts} '
+            'INNER JOIN {translations} t ON t.id = {fts}.rowid '
+            'INNER JOIN {articles} a ON a.id = t.master_id '
+            'WHERE {fts} MATCH %s AND a.app_config_id = %s '
+            'AND t.language_code IN ({languages}) '
+            'ORDER BY score DESC LIMIT %s'
+            ).format(
+            fts=SQLITE_FTS_TABLE, translations=translations, articles=articles,
+            languages=', '.join(['%s'] * len(languages)),
+            )
+        params = [fts_query, app_config.pk] + list(languages) + [
+            SEARCH_MAX_RESULTS]
+        return self.fetch_ranked_ids(sql, params)
+
+
+SEARCH_BACKENDS = {
+    'mysql': MySQLSearchBackend,
+    'postgresql': PostgreSQLSearchBackend,
+    'sqlite': SQLiteSearchBackend,
+    }
+
+
+def get_search_backend():
+    """
+    Returns the backend set in ALDRYN_NEWSBLOG_SEARCH_BACKEND, or the one
+    matching the database in use.
+    """
+    path = getattr(settings, 'ALDRYN_NEWSBLOG_SEARCH_BACKEND', None)
+    if path:
+        return import_string(path)()
+    return SEARCH_BACKENDS.get(connection.vendor, SearchBackend)()
@@ -2,7 +2,11 @@
 
 from __future__ import unicode_literals
 
+from datetime import timedelta
+from io import StringIO
+
 from django.core.management import call_command
+from django.utils.timezone import now
 from django.utils.translation import activate
 
 from aldryn_newsblog.models import Article
@@ -31,6 +35,42 @@ class TestCommands(NewsBlogTestCase):
         # make sure search data is empty
         self.assertEqual(article.search_data, '')
         # now run the command
-        call_command('rebuild_article_search_data', languages=[self.language])
+        call_command(
+            'rebuild_article_search_data', languages=[self.language],
+            stdout=StringIO())
         # now verify the article's search_data has been updated.
         self.assertEqual(article.search_data, search_data)
+
+    def test_rebuild_search_data_command_skips_unchanged(self):
+        activate(self.language)
+        article = self.create_article(lead_in='parser')
+        self.create_article(lead_in='renderer')
+        call_command(
+            'rebuild_article_search_data', languages=[self.language],
+            stdout=StringIO())
+        article.translations.filter(
+            language_code=self.language).update(search_data='')
+
+        out = StringIO()
+        call_command(
+            'rebuild_article_search_data', languages=[self.language],
+            stdout=out)
+        self.assertIn('1 translations updated, 1 unchanged', out.getvalue())
+
+    def test_rebuild_search_data_command_changed_since(self):
+        activate(self.language)
+        old_article = self.create_article(
+            lead_in='parser', publishing_date=now() - timedelta(days=30))
+        article = self.create_article(lead_in='renderer')
+        Article._parler_meta.root_model.objects.filter(
+            language_code=self.language).update(search_data='')
+
+        changed_since = (now() - timedelta(days=1)).strftime('%Y-%m-%d')
+        call_command(
+            'rebuild_article_search_data', languages=[self.language],
+            changed_since=changed_since, stdout=StringIO())
+        article = Article.objects.language(self.language).get(pk=article.pk)
+        old_article = Article.objects.language(self.language).get(
+            pk=old_article.pk)
+        self.assertEqual(article.search_data, 'renderer')
+        self.assertEqual(old_article.search_data, '')
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import datetime
+
+from django.utils.timezone import now
+
+from aldryn_newsblog.models import (
+    Article, NewsBlogAuthorsPlugin, NewsBlogCategoriesPlugin,
+    NewsBlogTagsPlugin,
+    )
+
+from . import NewsBlogTestCase
+
+
+class TestPluginAggregates(NewsBlogTestCase):
+
+    def test_authors_are_counted_by_published_articles(self):
+        author1 = self.create_person()
+        author2 = self.create_person()
+        for _ in range(3):
+            self.create_article(author=author1)
+        self.create_article(author=author2)
+        self.create_article(author=author2, is_published=False)
+        self.create_person()
+
+        plugin = NewsBlogAuthorsPlugin(app_config=self.app_config)
+        authors = plugin.get_authors(self.get_request())
+        self.assertEqual(
+            [(author.pk, author.article_count) for author in authors],
+            [(author1.pk, 3), (author2.pk, 1)],
+            )
+
+    def test_categories_are_counted_by_published_articles(self):
+        for _ in range(2):
+            self.create_article().categories.add(self.category1)
+        article = self.create_article(
+            publishing_date=now() + datetime.timedelta(days=1))
+        article.categories.add(self.category2)
+
+        plugin = NewsBlogCategoriesPlugin(app_config=self.app_config)
+        categories = plugin.get_categories(self.get_request())
+        self.assertEqual(
+            [(category.pk, category.article_count) for category in categories],
+            [(self.category1.pk, 2)],
+            )
+
+    def test_tags_are_counted_by_published_articles(self):
+        articles = self.create_tagged_articles(2, tags=('tag1', 'tag2'))
+        self.create_tagged_articles(3, tags=('tag3', ), is_published=False)
+        articles['tag2'][0].tags.add('tag1')
+
+        plugin = NewsBlogTagsPlugin(app_config=self.app_config)
+        tags = plugin.get_tags(self.get_request())
+        self.assertEqual(
+            [(tag.slug, tag.article_count) for tag in tags],
+            [('tag1', 3), ('tag2', 2)],
+            )
+
+    def test_aggregates_are_cached_until_an_article_changes(self):
+        author = self.create_person()
+        self.create_article(author=author)
+        plugin = NewsBlogAuthorsPlugin(app_config=self.app_config)
+        request = self.get_request()
+        self.assertEqual(plugin.get_authors(request)[0].article_count, 1)
+
+        with self.assertNumQueries(0):
+            plugin.get_authors(request)
+
+        article = self.create_article(author=author, is_published=False)
+        self.assertEqual(plugin.get_authors(request)[0].article_count, 1)
+        article.is_published = True
+        article.save()
+        self.assertEqual(plugin.get_authors(request)[0].article_count, 2)
+
+    def test_get_months(self):
+        dates = [
+            datetime.datetime(2019, 1, 15),
+            datetime.datetime(2019, 1, 20),
+            datetime.datetime(2019, 3, 1),
+            ]
+        for publishing_date in dates:
+            self.create_article(publishing_date=publishing_date)
+        self.create_article(
+            publishing_date=dates[0].replace(month=2), is_published=False)
+
+        months = Article.objects.get_months(
+            self.get_request(), self.app_config.namespace)
+        self.assertEqual(months, [
+            {'date': datetime.date(2019, 3, 3), 'num_articles': 1},
+            {'date': datetime.date(2019, 1, 3), 'num_articles': 2},
+            ])
+
+        self.create_article(publishing_date=dates[2])
+        months = Article.objects.get_months(
+            self.get_request(), self.app_config.namespace)
+        self.assertEqual(months[0]['num_articles'], 2)
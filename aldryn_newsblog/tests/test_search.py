@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+from django.urls import reverse
+from django.utils.translation import override
+
+from aldryn_newsblog.models import Article, NewsBlogConfig
+from aldryn_newsblog.search_backends import SearchBackend, get_search_backend
+
+from . import NewsBlogTestCase
+
+
+class TestArticleSearch(NewsBlogTestCase):
+
+    def search(self, query, app_config=None):
+        return list(get_search_backend().search(
+            Article.objects.all(), query, [self.language],
+            app_config or self.app_config))
+
+    def test_search_matches_every_word_as_prefix(self):
+        article = self.create_article(title='Implementing the parser')
+        self.create_article(title='Implementing the renderer')
+        self.assertEqual(self.search('implement pars'), [article])
+        self.assertEqual(len(self.search('implementing')), 2)
+        self.assertEqual(self.search('compiler'), [])
+
+    def test_search_ranks_more_relevant_articles_first(self):
+        once = self.create_article(title='Weekly report', lead_in='parser')
+        often = self.create_article(
+            title='Parser progress', lead_in='parser parser parser')
+        self.assertEqual(self.search('parser'), [often, once])
+
+    def test_search_is_limited_to_the_section(self):
+        other_config = NewsBlogConfig.objects.language(self.language).create(
+            app_title='other', namespace='other')
+        article = self.create_article(title='Parser week')
+        self.create_article(title='Parser week', app_config=other_config)
+        self.assertEqual(self.search('parser'), [article])
+
+    def test_search_follows_search_data_updates(self):
+        article = self.create_article(title='Weekly report')
+        Article._parler_meta.root_model.objects.filter(
+            master=article).update(search_data='tokenizer')
+        self.assertEqual(self.search('tokenizer'), [article])
+
+    def test_fallback_backend(self):
+        article = self.create_article(title='Implementing the parser')
+        self.assertEqual(
+            list(SearchBackend().search(
+                Article.objects.all(), 'the pars', [self.language],
+                self.app_config)),
+            [article])
+
+    def test_search_view(self):
+        article = self.create_article(title='Implementing the parser')
+        self.create_article(title='Implementing the renderer')
+        with override(self.language):
+            url = reverse('{0}:article-search'.format(
+                self.app_config.namespace))
+        response = self.client.get(url, {'q': 'parser'})
+        self.assertContains(response, article.title)
+        self.assertNotContains(response, 'Implementing the renderer')
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import datetime
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.template import RequestContext, Template
+from django.test import RequestFactory
+from django.utils.timezone import now
+from django.utils.translation import override
+
+from . import NewsBlogTestCase
+
+
+class TestArticleDetail(NewsBlogTestCase):
+
+    def test_neighbour_articles(self):
+        today = now()
+        first, second, third = [
+            self.create_article(
+                publishing_date=today - datetime.timedelta(days=days))
+            for days in (3, 2, 1)]
+        self.create_article(
+            publishing_date=today - datetime.timedelta(days=4),
+            is_published=False)
+
+        with override(self.language):
+            response = self.client.get(second.get_absolute_url())
+            self.assertEqual(response.context['prev_article'], first)
+            self.assertEqual(response.context['next_article'], third)
+
+            response = self.client.get(first.get_absolute_url())
+            self.assertIsNone(response.context['prev_article'])
+            self.assertEqual(response.context['next_article'], second)
+
+
+class TestArticleComments(NewsBlogTestCase):
+
+    def render_comments(self, article, user=None):
+        # the way the comments placeholder includes the template
+        template = Template(
+            '{% include "aldryn_newsblog/includes/comments.html" '
+            'with comments=article.get_root_comments %}')
+        request = RequestFactory().get(article.get_absolute_url())
+        request.user = user or AnonymousUser()
+        return template.render(RequestContext(request, {'article': article}))
+
+    def test_included_with_root_comments(self):
+        from gsoc.models import Comment
+
+        cache.clear()
+        article = self.create_article()
+        comment = Comment.objects.create(
+            article=article, username='reader', content='First comment')
+        reply = Comment.objects.create(
+            article=article, username='owner', content='A reply',
+            parent=comment)
+
+        content = self.render_comments(article)
+        self.assertIn('First comment', content)
+        self.assertIn('A reply', content)
+        self.assertIn('id="form-root"', content)
+        self.assertIn('id="form-{}"'.format(comment.pk), content)
+        self.assertIn('id="form-{}"'.format(reply.pk), content)
+
+    def test_included_without_comments(self):
+        cache.clear()
+        content = self.render_comments(self.create_article())
+        self.assertIn('id="form-root"', content)
+        self.assertIn('name="article"', content)
+
+    def test_comment_text_is_not_filled_in(self):
+        from gsoc.models import Comment
+
+        cache.clear()
+        article = self.create_article()
+        text = ('Log in as COMMENTUSERNAME (COMMENTUSERPK) with '
+                'COMMENTCSRFTOKEN, username userpk csrftoken')
+        Comment.objects.create(
+            article=article, username='COMMENTUSERNAME', content=text)
+        reader = self.create_user(username='reader')
+
+        for _ in range(2):
+            # rendered into the cache, then read from it
+            content = self.render_comments(article, reader)
+            self.assertIn(text, content)
+            self.assertIn('COMMENTUSERNAME', content)
+            self.assertIn('value="reader"', content)
+            self.assertIn('value="{}"'.format(reader.pk), content)
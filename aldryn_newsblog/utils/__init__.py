@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from .utilities import (  # NOQA
-    add_prefix_to_path, default_reverse, get_cleaned_bits, get_field_value,
-    get_plugin_index_data, get_request, strip_tags,
+    add_prefix_to_path, default_reverse, get_cached_aggregate,
+    get_cleaned_bits, get_field_value, get_plugin_index_data, get_request,
+    invalidate_aggregates, strip_tags,
 )
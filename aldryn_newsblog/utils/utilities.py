@@ -2,10 +2,13 @@
 
 from __future__ import unicode_literals
 
+import uuid
+
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
 from django.contrib.sites.models import Site
 from django.contrib.sites.shortcuts import get_current_site
+from django.core.cache import cache
 from django.db import models
 from django.test import RequestFactory
 from django.urls import NoReverseMatch, reverse
@@ -20,6 +23,13 @@ from cms.utils.i18n import force_language, get_language_object
 from lxml.html.clean import Cleaner as LxmlCleaner
 
 
+# How long the per-section sidebar aggregates (authors, categories, tags and
+# archive months) are cached. Saving an article drops them right away, the
+# timeout only bounds how late scheduled articles show up in the counts.
+AGGREGATES_CACHE_DURATION = getattr(
+    settings, 'ALDRYN_NEWSBLOG_AGGREGATES_CACHE_DURATION', 60 * 5)
+
+
 def default_reverse(*args, **kwargs):
     """
     Acts just like django.urls.reverse() except that if the
@@ -199,3 +209,29 @@ def get_valid_languages(namespace, language_code, site_id=None):
         lang_code for lang_code in langs
         if is_valid_namespace_for_language(namespace, lang_code)]
     return valid_translations
+
+
+def get_aggregates_version_key(namespace):
+    return 'aldryn_newsblog:aggregates:{0}'.format(namespace)
+
+
+def get_cached_aggregate(namespace, name, edit_mode, build):
+    """
+    Returns the cached result of build() for the given section and edit
+    mode, building and caching it as a list on a miss.
+    """
+    version = cache.get(get_aggregates_version_key(namespace), '')
+    key = 'aldryn_newsblog:aggregates:{0}:{1}:{2}:{3}'.format(
+        namespace, version, name, int(bool(edit_mode)))
+    value = cache.get(key)
+    if value is None:
+        value = list(build())
+        cache.set(key, value, AGGREGATES_CACHE_DURATION)
+    return value
+
+
+def invalidate_aggregates(namespace):
+    """
+    Drops every cached aggregate of the given section.
+    """
+    cache.set(get_aggregates_version_key(namespace), uuid.uuid4().hex, None)
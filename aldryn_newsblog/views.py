@@ -4,7 +4,7 @@ from __future__ import unicode_literals
 
 from datetime import date, datetime
 
-from django.db.models import Q
+from django.db.models import Q, Subquery
 from django.http import (
     Http404, HttpResponsePermanentRedirect, HttpResponseRedirect,
     )
@@ -26,6 +26,7 @@ from aldryn_newsblog.compat import toolbar_edit_mode_active
 from aldryn_newsblog.utils.utilities import get_valid_languages_from_request
 
 from .models import Article
+from .search_backends import get_search_backend
 from .utils import add_prefix_to_path
 
 
@@ -113,8 +114,8 @@ class ArticleDetail(AppConfigMixin, AppHookCheckMixin, PreviewModeMixin,
         """
         if not hasattr(self, 'object'):
             self.object = self.get_object()
-        set_language_changer(request, self.object.get_absolute_url)
-        url = self.object.get_absolute_url()
+        set_language_changer(request, self.get_object_url)
+        url = self.get_object_url()
         if self.config.non_permalink_handling == 200 or request.path == url:
             # Continue as normal
             return super(ArticleDetail, self).get(request, *args, **kwargs)
@@ -153,43 +154,53 @@ class ArticleDetail(AppConfigMixin, AppHookCheckMixin, PreviewModeMixin,
         raise AttributeError('ArticleDetail view must be called with either '
                              'an object pk or a slug')
 
+    def get_object_url(self, language=None):
+        """
+        Returns the absolute url of the article, each language is only
+        resolved once per request.
+        """
+        language = language or translation.get_language()
+        urls = self.__dict__.setdefault('_object_urls', {})
+        if language not in urls:
+            urls[language] = self.object.get_absolute_url(language)
+        return urls[language]
+
     def get_context_data(self, **kwargs):
         context = super(ArticleDetail, self).get_context_data(**kwargs)
-        context['prev_article'] = self.get_prev_object(
-            self.queryset, self.object)
-        context['next_article'] = self.get_next_object(
-            self.queryset, self.object)
+        context['prev_article'], context['next_article'] = (
+            self.get_neighbour_objects(self.queryset, self.object))
         return context
 
-    def get_prev_object(self, queryset=None, object=None):
+    def get_neighbour_objects(self, queryset=None, object=None):
+        """
+        Returns the previous and the next article by publishing date, both
+        fetched in a single query.
+        """
         if queryset is None:
             queryset = self.get_queryset()
         if object is None:
-            object = self.get_object(self)
-        prev_objs = queryset.filter(
+            object = self.object
+        prev_pk = queryset.filter(
             publishing_date__lt=object.publishing_date
-            ).order_by(
-            '-publishing_date'
-            )[:1]
-        if prev_objs:
-            return prev_objs[0]
-        else:
-            return None
+            ).order_by('-publishing_date').values('pk')[:1]
+        next_pk = queryset.filter(
+            publishing_date__gt=object.publishing_date
+            ).order_by('publishing_date').values('pk')[:1]
+        prev_obj = next_obj = None
+        # the translation joins may repeat a row once per valid language
+        for neighbour in queryset.filter(
+                Q(pk=Subquery(prev_pk)) | Q(pk=Subquery(next_pk))):
+            if neighbour.publishing_date < object.publishing_date:
+                prev_obj = neighbour
+            else:
+                next_obj = neighbour
+        return prev_obj, next_obj
+
+    def get_prev_object(self, queryset=None, object=None):
+        return self.get_neighbour_objects(queryset, object)[0]
 
     def get_next_object(self, queryset=None, object=None):
-        if queryset is None:
-            queryset = self.get_queryset()
-        if object is None:
-            object = self.get_object(self)
-        next_objs = queryset.filter(
-            publishing_date__gt=object.publishing_date
-            ).order_by(
-            'publishing_date'
-            )[:1]
-        if next_objs:
-            return next_objs[0]
-        else:
-            return None
+        return self.get_neighbour_objects(queryset, object)[1]
 
 
 class ArticleListBase(AppConfigMixin, AppHookCheckMixin, TemplatePrefixMixin,
@@ -278,18 +289,15 @@ class ArticleSearchResultsList(ArticleListBase):
         paginate by the app_config's settings.
         """
         return self.max_articles or super(
-            ArticleSearchResultsList, self).get_paginate_by(self.get_queryset())
+            ArticleSearchResultsList, self).get_paginate_by(queryset)
 
     def get_queryset(self):
         qs = super(ArticleSearchResultsList, self).get_queryset()
         if not self.edit_mode:
             qs = qs.published()
         if self.query:
-            return qs.filter(
-                Q(translations__title__icontains=self.query) |  # noqa: #W504
-                Q(translations__lead_in__icontains=self.query) |  # noqa: #W504
-                Q(translations__search_data__icontains=self.query)
-            ).distinct()
+            return get_search_backend().search(
+                qs, self.query, self.valid_languages, self.config)
         else:
             return qs.none()
 
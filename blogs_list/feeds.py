@@ -3,21 +3,23 @@ import unicodedata
 
 from django.contrib.syndication.views import Feed
 from django.utils.feedgenerator import DefaultFeed
-from django.utils import timezone
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
 from django.test.client import RequestFactory
 from django.template import RequestContext
 from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
-from django.http import HttpResponseNotFound
+from django.http import Http404, HttpResponseNotFound
 
 from gsoc.models import UserProfile, GsocYear
+from gsoc.common.utils.blogs import (
+    articles_feed_cache_key,
+    get_blog_by_namespace,
+    get_blog_by_slug,
+    )
 
-from aldryn_newsblog.cms_appconfig import NewsBlogConfig
 from aldryn_newsblog.models import Article
 
-from cms.models import Page, Site, Title
 from cms.plugin_rendering import ContentRenderer
 
 
@@ -104,22 +106,17 @@ class BlogsFeed(Feed):
     description = "Updates on different contributor blogs of GSoC@PSF"
 
     def get_object(self, request):
-        current_year = GsocYear.objects.first().gsoc_year
+        current_year = GsocYear.objects.get_current().gsoc_year
         try:
-            gsoc_year = int(request.GET.get("y", current_year))
+            gsoc_year = GsocYear.objects.get_by_year(int(request.GET.get("y", current_year)))
         except ValueError:
             raise ObjectDoesNotExist
-        year_qs = GsocYear.objects.filter(gsoc_year=gsoc_year)
-        if len(year_qs) == 0:
-            raise ObjectDoesNotExist
-        else:
-            self.year = year_qs.first().gsoc_year
+        self.year = gsoc_year.gsoc_year
         self.title = f"GSoC {self.year} PSF Blogs"
-        year_start = timezone.datetime(self.year, 1, 1)
-        year_end = timezone.datetime(self.year, 12, 31)
+        year_start, year_end = gsoc_year.get_bounds()
         articles_all = list(
             Article.objects.filter(
-                publishing_date__gte=year_start, publishing_date__lte=year_end
+                publishing_date__gte=year_start, publishing_date__lt=year_end
                 )
             .order_by("-publishing_date")
             .all()
@@ -183,47 +180,60 @@ class BlogsFeed(Feed):
         return item.publishing_date
 
     def item_guid(self, item):
-        site = Site.objects.first()
         return self.item_link(item)
 
     def item_guid_is_permalink(self, item):
         return True
 
     def item_link(self, item):
-        site = Site.objects.first()
-        section = item.app_config
-        p = Page.objects.get(
-            application_namespace=section.namespace, publisher_is_draft=False
-            )
-        url = "{}{}{}/".format(self.link, p.get_absolute_url(), item.slug, "/")
-        return url
+        blog = get_blog_by_namespace(item.app_config.namespace)
+        return "{}{}{}/".format(self.link, blog.url, item.slug)
 
 
 class ArticlesFeed(Feed):
 
-    year = GsocYear.objects.first().gsoc_year
     link = settings.INETLOCATION
     feed_type = BaseCorrectMimeTypeFeed
-
-    def title(self):
-        return f"Articles on {self.blog_title}"
-
-    def description(self):
-        return f"Updates on different articles published on {self.blog_title}"
+    max_items = 30
+    cache_timeout = 15 * 60
+
+    def __call__(self, request, *args, **kwargs):
+        blog = get_blog_by_slug(kwargs.get("blog_slug"))
+        if blog is None:
+            raise Http404("Feed object does not exist.")
+        key = articles_feed_cache_key(blog.namespace)
+        response = cache.get(key)
+        if response is None:
+            response = super(ArticlesFeed, self).__call__(request, *args, **kwargs)
+            cache.set(key, response, self.cache_timeout)
+        return response
+
+    def title(self, obj):
+        return f"Articles on {obj.title}"
+
+    def description(self, obj):
+        return f"Updates on different articles published on {obj.title}"
 
     def feed_url(self, obj):
-        return f"{settings.INETLOCATION}/en/feed/{self.blog_slug}/"
+        return f"{settings.INETLOCATION}/en/feed/{obj.slug}/"
 
     def get_object(self, request, blog_slug):
-        self.blog_slug = blog_slug
-        page = Title.objects.get(slug=blog_slug, publisher_is_draft=False).page
-        section = NewsBlogConfig.objects.get(namespace=page.application_namespace)
-        self.blog_title = section.app_title
-        articles = list(section.article_set.all())
-        return articles
+        blog = get_blog_by_slug(blog_slug)
+        if blog is None:
+            raise ObjectDoesNotExist
+        return blog
 
     def items(self, obj):
-        return obj
+        articles = list(
+            Article.objects.published()
+            .filter(app_config__namespace=obj.namespace)
+            .select_related("owner")
+            .prefetch_related("translations")
+            .order_by("-publishing_date")[:self.max_items]
+            )
+        for article in articles:
+            article.blog_url = obj.url
+        return articles
 
     def item_author_name(self, item):
         return item.owner.username
@@ -246,17 +256,10 @@ class ArticlesFeed(Feed):
         return item.publishing_date
 
     def item_guid(self, item):
-        site = Site.objects.first()
         return self.item_link(item)
 
     def item_guid_is_permalink(self, item):
         return True
 
     def item_link(self, item):
-        site = Site.objects.first()
-        section = item.app_config
-        p = Page.objects.get(
-            application_namespace=section.namespace, publisher_is_draft=False
-            )
-        url = "{}{}{}/".format(self.link, p.get_absolute_url(), item.slug, "/")
-        return url
+        return "{}{}{}/".format(self.link, item.blog_url, item.slug)
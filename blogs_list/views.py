@@ -1,58 +1,123 @@
 import os
 import random
 
+from django.core.cache import cache
+from django.db.models import Case, IntegerField, OuterRef, Subquery, Value, When
 from django.shortcuts import render
 from django.contrib import messages
+from django.utils.translation import get_language
 
-from gsoc.models import GsocYear, UserProfile
+from gsoc.models import UserProfile
 from gsoc.settings import MEDIA_URL
+from gsoc.common.utils.blogs import (
+    BLOGS_CACHE_TIMEOUT,
+    blog_directory_cache_key,
+    blog_directory_years_cache_key,
+    get_page_url,
+    )
 
-from cms.models import Page
+from aldryn_newsblog.cms_appconfig import NewsBlogConfig
+
+from cms.models import Title
+
+
+COLORS = ["umber", "khaki", "wine", "straw"]
+
+
+def build_blog_directory(language):
+    """
+    Returns a dict of gsoc year -> list of blogs of that year,
+    built from a single query over the published blog pages.
+    """
+    title_translations = NewsBlogConfig._parler_meta.root_model.objects.filter(
+        master_id=OuterRef("app_config_id")
+        ).annotate(
+        is_current=Case(
+            When(language_code=language, then=Value(0)),
+            default=Value(1),
+            output_field=IntegerField(),
+            )
+        ).order_by("is_current").values("app_title")[:1]
+    # a page without a translation in `language` is linked through another one
+    page_titles = Title.objects.filter(
+        page__application_namespace=OuterRef("app_config__namespace"),
+        page__publisher_is_draft=False,
+        ).annotate(
+        is_current=Case(
+            When(language=language, then=Value(0)),
+            default=Value(1),
+            output_field=IntegerField(),
+            )
+        ).order_by("is_current", "pk").values("path")[:1]
+    profiles = (
+        UserProfile.objects.filter(app_config__isnull=False, gsoc_year__isnull=False)
+        .annotate(blog_title=Subquery(title_translations), blog_path=Subquery(page_titles))
+        .filter(blog_path__isnull=False)
+        .order_by("-gsoc_year", "id")
+        .values_list(
+            "gsoc_year",
+            "blog_title",
+            "blog_path",
+            "user__username",
+            "user__first_name",
+            "user__last_name",
+            "suborg_full_name__suborg_name",
+            "accepted_proposal_pdf",
+            "proposal_confirmed",
+            )
+        )
+
+    directory = {}
+    for (year, title, path, username, first_name, last_name, suborg,
+         proposal_name, proposal_confirmed) in profiles:
+        student_name = f"{first_name} {last_name}".strip()
+        proposal_path = (
+            os.path.join(MEDIA_URL, proposal_name)
+            if proposal_confirmed and proposal_name
+            else None
+            )
+        directory.setdefault(year, []).append(
+            {
+                "title": title,
+                "url": get_page_url(path, language),
+                "student": student_name if student_name else username,
+                "suborg": suborg,
+                "proposal": proposal_path,
+                }
+            )
+    return directory
+
+
+def get_blog_directory(language):
+    """
+    Returns the cached blog directory as a list of (year, blogs),
+    latest year first.
+    """
+    years = cache.get(blog_directory_years_cache_key(language))
+    if years is not None:
+        keys = {blog_directory_cache_key(year, language): year for year in years}
+        cached = cache.get_many(keys.keys())
+        if len(cached) == len(keys):
+            return [(keys[key], cached[key]) for key in keys]
+
+    directory = build_blog_directory(language)
+    years = sorted(directory, reverse=True)
+    cache.set_many(
+        {blog_directory_cache_key(year, language): directory[year] for year in years},
+        BLOGS_CACHE_TIMEOUT,
+        )
+    cache.set(blog_directory_years_cache_key(language), years, BLOGS_CACHE_TIMEOUT)
+    return [(year, directory[year]) for year in years]
 
 
 def list_blogs(request):
-    gsoc_years = GsocYear.objects.all().order_by("-gsoc_year")
+    rand = random.Random(request.META.get("REMOTE_ADDR"))
 
     blogsets = []
-    for year in gsoc_years:
-        profiles = UserProfile.objects.filter(gsoc_year=year)
-        flag = False
-
-        blogset = []
-        for profile in profiles:
-            if profile.app_config:
-                flag = True
-                ns = profile.app_config.namespace
-                page = Page.objects.get(
-                    application_namespace=ns, publisher_is_draft=False
-                    )
-                student_name = profile.user.get_full_name()
-                student_username = profile.user.username
-                proposal_name = (
-                    profile.accepted_proposal_pdf.name
-                    if profile.proposal_confirmed
-                    else None
-                    )
-                proposal_path = (
-                    os.path.join(MEDIA_URL, proposal_name) if proposal_name else None
-                    )
-
-                blogset.append(
-                    {
-                        "title": profile.app_config.app_title,
-                        "url": page.get_absolute_url(),
-                        "student": student_name if student_name else student_username,
-                        "suborg": profile.suborg_full_name.suborg_name,
-                        "color": random.choice(["umber", "khaki", "wine", "straw"]),
-                        "proposal": proposal_path if proposal_name else None,
-                        }
-                    )
-
-        if flag:
-            ip_seed = int(request.META.get("REMOTE_ADDR").replace(".", ""))
-            random.seed(ip_seed)
-            random.shuffle(blogset)
-            blogsets.append((year.gsoc_year, blogset))
+    for year, blogs in get_blog_directory(get_language()):
+        blogset = [dict(blog, color=rand.choice(COLORS)) for blog in blogs]
+        rand.shuffle(blogset)
+        blogsets.append((year, blogset))
 
     if not blogsets:
         messages.add_message(
@@ -1,5 +1,6 @@
 from .models import *
 from .forms import (
+    AddUserLogForm,
     GeneratorForm,
     GsocEndDateStandardForm,
     GsocStartDateForm,
@@ -13,12 +14,13 @@ from .forms import (
 
 from datetime import datetime
 from django.contrib.auth.models import User
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.db.models import Count, Q
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 from django.utils.translation import ugettext_lazy as _
 from django.utils import timezone
 from django.utils.safestring import mark_safe
-from django.core.exceptions import PermissionDenied
+from django.core.exceptions import PermissionDenied, ValidationError
 from django.urls import reverse
 
 from aldryn_people.models import Person
@@ -27,6 +29,8 @@ from aldryn_newsblog.models import Article
 
 from cms.models import Page, PagePermission
 
+from gsoc.common.utils.blogs import get_blog_by_namespace
+
 
 class UserProfileInline(admin.TabularInline):
     model = UserProfile
@@ -394,9 +398,10 @@ class HiddenUserProfileAdmin(admin.ModelAdmin):
 
     def blog_link(self, obj):
         ns = obj.app_config.namespace
-        page = Page.objects.get(application_namespace=ns, publisher_is_draft=False)
-        url = page.get_absolute_url()
-        return mark_safe(f'<a href="{url}">{ns}</a>')
+        blog = get_blog_by_namespace(ns)
+        if blog is None:
+            return ns
+        return mark_safe(f'<a href="{blog.url}">{ns}</a>')
 
     def email(self, obj):
         return obj.user.email
@@ -476,9 +481,10 @@ class HiddenGSOCInviteAdmin(admin.ModelAdmin):
 
     def blog_link(self, obj):
         ns = obj.app_config.namespace
-        page = Page.objects.get(application_namespace=ns, publisher_is_draft=False)
-        url = page.get_absolute_url()
-        return mark_safe(f'<a href="{url}">{ns}</a>')
+        blog = get_blog_by_namespace(ns)
+        if blog is None:
+            return ns
+        return mark_safe(f'<a href="{blog.url}">{ns}</a>')
 
     def email(self, obj):
         return obj.user.email
@@ -528,11 +534,39 @@ class RegLinkInline(admin.TabularInline):
 
 
 class AddUserLogAdmin(admin.ModelAdmin):
+    form = AddUserLogForm
     list_display = ("log_id", "used_stat")
     readonly_fields = ("log_id",)
     inlines = (RegLinkInline,)
     change_form_template = "admin/adduserlog_change_form.html"
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            reglinks_count=Count("reglinks"),
+            used_reglinks_count=Count("reglinks", filter=Q(reglinks__is_used=True)),
+            )
+
+    def save_formset(self, request, form, formset, change):
+        if formset.model is not RegLink:
+            return super().save_formset(request, form, formset, change)
+        # the new links and their schedulers are created in bulk
+        reglinks = formset.save(commit=False)
+        for reglink in formset.deleted_objects:
+            reglink.delete()
+        for reglink in reglinks:
+            if reglink.pk is not None:
+                reglink.save()
+        RegLink.objects.bulk_invite([reglink for reglink in reglinks if reglink.pk is None])
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        invites = form.cleaned_data.get("invites_csv")
+        if invites:
+            for reglink in invites:
+                reglink.adduserlog = form.instance
+            invites = RegLink.objects.bulk_invite(invites)
+            self.message_user(request, f"{len(invites)} invites were added from the CSV file.")
+
     def changeform_view(self, request, object_id, form_url="", extra_context=None):
         extra_context = extra_context or {}
         extra_context["years"] = GsocYear.objects.all()
@@ -548,9 +582,7 @@ class AddUserLogAdmin(admin.ModelAdmin):
             )
 
     def used_stat(self, obj):
-        _all = len(RegLink.objects.filter(adduserlog=obj))
-        _used = len(RegLink.objects.filter(adduserlog=obj, is_used=True))
-        return "{}/{}".format(_used, _all)
+        return "{}/{}".format(obj.used_reglinks_count, obj.reglinks_count)
 
 
 admin.site.register(AddUserLog, AddUserLogAdmin)
@@ -635,6 +667,18 @@ class TimelineAdmin(admin.ModelAdmin):
 admin.site.register(Timeline, TimelineAdmin)
 
 
+def mark_reviewed(self, request, queryset):
+    try:
+        reviewed = queryset.mark_reviewed(request.user)
+    except ValidationError as err:
+        self.message_user(request, " ".join(err.messages), level=messages.ERROR)
+        return
+    self.message_user(request, "{} articles marked as reviewed.".format(reviewed))
+
+
+mark_reviewed.short_description = "Mark as reviewed"
+
+
 class ArticleReviewAdmin(admin.ModelAdmin):
     list_display = (
         "article",
@@ -644,6 +688,7 @@ class ArticleReviewAdmin(admin.ModelAdmin):
         "last_reviewed_by",
         )
     list_filter = ("last_reviewed_by", "is_reviewed")
+    actions = [mark_reviewed]
     fields = (
         "article",
         "is_reviewed",
@@ -780,7 +825,7 @@ admin.site.register(Comment, CommentAdmin)
 
 class SendEmailAdmin(admin.ModelAdmin):
     list_display = ("to", "to_group", "subject")
-    exclude = ("scheduler",)
+    exclude = ("schedulers",)
 
     def has_change_permission(self, request, obj=None):
         return False
@@ -797,8 +842,12 @@ class BlogPostHistoryAdmin(admin.ModelAdmin):
     def has_change_permission(self, request, obj=None):
         return False
 
+    def has_delete_permission(self, request, obj=None):
+        # the following revisions are stored as diffs against this one
+        return False
+
     def content_safe(self, obj):
-        return mark_safe(obj.content)
+        return mark_safe(obj.get_content())
 
 
 admin.site.register(BlogPostHistory, BlogPostHistoryAdmin)
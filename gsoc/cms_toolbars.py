@@ -28,8 +28,7 @@ from aldryn_translation_tools.utils import get_admin_url, get_object_from_reques
 from aldryn_newsblog.models import Article
 from aldryn_newsblog.cms_toolbars import NewsBlogToolbar
 
-from cms.models import Page
-
+from gsoc.common.utils.blogs import get_blog_by_namespace
 from gsoc.models import ArticleReview
 
 
@@ -155,10 +154,9 @@ def add_goto_blog_button(self):
     user = getattr(self.request, "user", None)
     if user and user.is_current_year_student():
         profile = user.student_profile()
-        ns = profile.app_config.namespace
-        page = Page.objects.get(application_namespace=ns, publisher_is_draft=False)
-        url = page.get_absolute_url()
-        self.toolbar.add_button(_("My Blog"), url, side=self.toolbar.RIGHT)
+        blog = get_blog_by_namespace(profile.app_config.namespace)
+        if blog is not None:
+            self.toolbar.add_button(_("My Blog"), blog.url, side=self.toolbar.RIGHT)
 
 
 def populate(self):
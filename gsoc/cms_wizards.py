@@ -72,7 +72,7 @@ class CreateNewsBlogArticleForm(BaseFormMixin, TranslatableModelForm):
         # app_config choice field, we'll choose the option for the user.
         get_published_app_configs()
 
-        gsoc_year = GsocYear.objects.first()
+        gsoc_year = GsocYear.objects.get_current()
         student_role = {i[1]: i[0] for i in UserProfile.ROLES}['Student']
         userprofiles = self.user.userprofile_set.filter(gsoc_year=gsoc_year,
                                                         role=student_role)
@@ -0,0 +1,180 @@
+import hashlib
+import uuid
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import NoReverseMatch, reverse
+from django.utils.translation import get_language
+
+from aldryn_newsblog.cms_appconfig import NewsBlogConfig
+
+from cms.models import Title
+from cms.utils.i18n import force_language
+
+
+BLOGS_CACHE_TIMEOUT = 60 * 60
+BLOGS_VERSION_KEY = "blogs:version"
+
+BlogInfo = namedtuple("BlogInfo", ["namespace", "slug", "url", "feed_url", "title"])
+
+
+def get_blogs_version():
+    """
+    Returns the token all blog cache keys are built with.
+    """
+    version = cache.get(BLOGS_VERSION_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(BLOGS_VERSION_KEY, version, None):
+            version = cache.get(BLOGS_VERSION_KEY, version)
+    return version
+
+
+def invalidate_blogs():
+    """
+    Drops every cached blog lookup, e.g. after a CMS page is (un)published.
+    """
+    cache.set(BLOGS_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def blog_cache_key(*parts):
+    return ":".join(["blogs", get_blogs_version()] + [str(_) for _ in parts])
+
+
+def get_page_url(path, language):
+    """
+    Builds the url of a CMS page from its title path, like `Page.get_absolute_url`.
+    """
+    with force_language(language):
+        if not path:
+            return reverse("pages-root")
+        return reverse("pages-details-by-slug", kwargs={"slug": path})
+
+
+def build_blog_info(title, section):
+    try:
+        with force_language(title.language):
+            feed_url = reverse("blogs_list:blog_feed", kwargs={"blog_slug": title.slug})
+    except NoReverseMatch:
+        # the feeds are not part of every urlconf, e.g. the newsblog tests
+        feed_url = None
+    return BlogInfo(
+        namespace=section.namespace,
+        slug=title.slug,
+        url=get_page_url(title.path, title.language),
+        feed_url=feed_url,
+        title=section.app_title,
+        )
+
+
+def get_blog_by_slug(slug):
+    """
+    Resolves the slug of a published blog page to a `BlogInfo`,
+    returns None if there is no such blog.
+    """
+    key = blog_cache_key("slug", slug)
+    blog = cache.get(key)
+    if blog is None:
+        title = (
+            Title.objects.select_related("page")
+            .filter(
+                slug=slug,
+                publisher_is_draft=False,
+                page__application_namespace__isnull=False,
+                )
+            .first()
+            )
+        if title is None:
+            return None
+        namespace = title.page.application_namespace
+        section = NewsBlogConfig.objects.filter(namespace=namespace).first()
+        if section is None:
+            return None
+        blog = build_blog_info(title, section)
+        cache.set(key, blog, BLOGS_CACHE_TIMEOUT)
+    return blog
+
+
+def get_blog_by_namespace(namespace, language=None):
+    """
+    Resolves the apphook namespace of a published blog page to a `BlogInfo`
+    in the given or active language, returns None if there is no such blog.
+    """
+    language = language or get_language()
+    key = blog_cache_key("namespace", language, namespace)
+    blog = cache.get(key)
+    if blog is None:
+        titles = {
+            title.language: title
+            for title in Title.objects.filter(
+                page__application_namespace=namespace,
+                page__publisher_is_draft=False,
+                publisher_is_draft=False,
+                )
+            }
+        title = titles.get(language) or next(iter(titles.values()), None)
+        section = (
+            NewsBlogConfig.objects.filter(namespace=namespace).first() if title else None
+            )
+        # misses are cached too, as False
+        blog = build_blog_info(title, section) if section else False
+        cache.set(key, blog, BLOGS_CACHE_TIMEOUT)
+    return blog or None
+
+
+def articles_feed_cache_key(namespace):
+    return blog_cache_key("feed", namespace)
+
+
+def invalidate_articles_feed(namespace):
+    cache.delete(articles_feed_cache_key(namespace))
+
+
+def blog_sitemap_cache_key(section, language):
+    return blog_cache_key("sitemap", language, section)
+
+
+def invalidate_blog_sitemap(namespace):
+    keys = []
+    for language, _ in settings.LANGUAGES:
+        keys.append(blog_sitemap_cache_key("index", language))
+        keys.append(blog_sitemap_cache_key(namespace, language))
+    cache.delete_many(keys)
+
+
+def blog_directory_cache_key(year, language):
+    return blog_cache_key("directory", language, year)
+
+
+def blog_directory_years_cache_key(language):
+    return blog_cache_key("directory", language, "years")
+
+
+def invalidate_blog_directory(year):
+    keys = []
+    for language, _ in settings.LANGUAGES:
+        keys.append(blog_directory_years_cache_key(language))
+        if year is not None:
+            keys.append(blog_directory_cache_key(year, language))
+    cache.delete_many(keys)
+
+
+def blog_page_version_key(namespace):
+    return "blogs:pages:{}".format(namespace)
+
+
+def blog_page_cache_key(namespace, language, path):
+    """
+    Builds the key of a cached anonymous blog page from its full path.
+    """
+    version = cache.get(blog_page_version_key(namespace), "")
+    digest = hashlib.md5(path.encode("utf-8")).hexdigest()
+    return blog_cache_key("page", namespace, version, language, digest)
+
+
+def invalidate_blog_pages(namespace):
+    """
+    Drops every cached page of the blog, e.g. after an article or comment changed.
+    """
+    cache.set(blog_page_version_key(namespace), uuid.uuid4().hex, None)
@@ -28,7 +28,7 @@ def build_pre_blog_reminders(builder):
     try:
         data = json.loads(builder.data)
         due_date = BlogPostDueDate.objects.get(pk=data["due_date_pk"])
-        gsoc_year = GsocYear.objects.first()
+        gsoc_year = GsocYear.objects.get_current()
         profiles = UserProfile.objects.filter(
             gsoc_year=gsoc_year,
             role=3,
@@ -72,7 +72,7 @@ def build_post_blog_reminders(builder):
         categories = ((0, "Weekly Check-In"), (1, "Blog Post"))
         category = categories[due_date.category][1]
 
-        gsoc_year = GsocYear.objects.first()
+        gsoc_year = GsocYear.objects.get_current()
         profiles = UserProfile.objects.filter(
             gsoc_year=gsoc_year,
             role=3,
@@ -147,7 +147,7 @@ def build_post_blog_reminders(builder):
 
 def build_revoke_student_perms(builder):
     try:
-        gsoc_year = GsocYear.objects.first()
+        gsoc_year = GsocYear.objects.get_current()
         profiles = UserProfile.objects.filter(gsoc_year=gsoc_year, role=3).all()
         for profile in profiles:
             Scheduler.objects.create(
@@ -159,7 +159,7 @@ def build_revoke_student_perms(builder):
 
 def build_remove_user_details(builder):
     try:
-        gsoc_year = GsocYear.objects.first()
+        gsoc_year = GsocYear.objects.get_current()
         profiles = UserProfile.objects.filter(
             gsoc_year=gsoc_year, role__in=[1, 2, 3]
             ).all()
@@ -371,7 +371,7 @@ def build_add_end_standard_to_calendar(builder):
 
 def build_evaluation_reminder(builder):
     data = json.loads(builder.data)
-    gsoc_year = GsocYear.objects.latest('gsoc_year')
+    gsoc_year = GsocYear.objects.get_current()
     start_date = GsocStartDate.objects.latest('date')
     start_date = start_date.date
     exam_date = datetime.strptime(data["exam_date"], "%Y-%m-%d").date()
@@ -5,10 +5,14 @@ from django.contrib.auth.models import User, Permission
 from django.conf import settings
 from django.utils import timezone
 
+from aldryn_newsblog.models import Article
+from parler.utils.context import switch_language
+
 # from .irc import send_message
 
 from gsoc.models import (
     Scheduler,
+    Comment,
     RegLink,
     GsocYear,
     UserProfile,
@@ -103,7 +107,7 @@ def send_reg_reminder(scheduler: Scheduler):
 
 def add_blog_counter(scheduler: Scheduler):
     try:
-        gsoc_year = GsocYear.objects.first()
+        gsoc_year = GsocYear.objects.get_current()
         current_profiles = UserProfile.objects.filter(gsoc_year=gsoc_year, role=3).all()
         for profile in current_profiles:
             profile.current_blog_count += 1
@@ -113,6 +117,66 @@ def add_blog_counter(scheduler: Scheduler):
         return str(e)
 
 
+def update_search_data(scheduler: Scheduler):
+    """
+    recompute the search data of all translations of an article
+    """
+    try:
+        article_id = json.loads(scheduler.data)["article_id"]
+        article = Article.objects.filter(pk=article_id).first()
+        if article is None:
+            return None
+        for translation in article.translations.all():
+            language = translation.language_code
+            with switch_language(article, language):
+                translation.search_data = article.get_search_data(language)
+            translation.save(update_fields=["search_data"])
+        return None
+    except Exception as e:
+        return str(e)
+
+
+def send_comment_notifications(schedulers):
+    """
+    expand the deferred notification events of new comments into emails,
+    loading the comments with their article owners and parent authors at once
+    """
+    comment_ids = {
+        scheduler.pk: json.loads(scheduler.data)["comment_id"] for scheduler in schedulers
+        }
+    comments = Comment.objects.select_related(
+        "article__app_config", "article__owner", "parent__user"
+        ).in_bulk(set(comment_ids.values()))
+
+    article_links = {}
+    notifications = []
+    errors = {}
+    for scheduler in schedulers:
+        comment = comments.get(comment_ids[scheduler.pk])
+        if comment is None:
+            # deleted before it could be notified
+            continue
+        try:
+            if comment.article_id not in article_links:
+                article_links[comment.article_id] = comment.article.get_absolute_url()
+            notifications.extend(
+                comment.build_notifications(article_links[comment.article_id])
+                )
+        except Exception as e:
+            errors[scheduler.pk] = str(e)
+    Scheduler.objects.bulk_create(notifications)
+
+    for scheduler in schedulers:
+        scheduler.success = scheduler.pk not in errors
+        scheduler.last_error = errors.get(scheduler.pk)
+    Scheduler.objects.bulk_update(schedulers, ["success", "last_error"])
+    return errors
+
+
+def send_comment_notification(scheduler: Scheduler):
+    return send_comment_notifications([scheduler]).get(scheduler.pk)
+
+
 def add_calendar_event(scheduler: Scheduler):
     try:
         pk = json.loads(scheduler.data)["event"]
@@ -126,7 +190,7 @@ def add_calendar_event(scheduler: Scheduler):
 def update_site_template(scheduler: Scheduler):
     try:
         template = json.loads(scheduler.data)["template"]
-        gsoc_year = GsocYear.objects.first()
+        gsoc_year = GsocYear.objects.get_current()
         if template == "deadlines.html":
             context = {
                 "events": Event.objects.filter(timeline__gsoc_year=gsoc_year).all(),
@@ -174,7 +238,7 @@ def update_site_template(scheduler: Scheduler):
 
 def archive_gsoc_pages(scheduler: Scheduler):
     try:
-        gsoc_year = GsocYear.objects.first()
+        gsoc_year = GsocYear.objects.get_current()
         archive_current_gsoc_files(gsoc_year.gsoc_year)
     except Exception as e:
         return str(e)
@@ -0,0 +1,86 @@
+import secrets
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.html import escape
+from django.utils.translation import get_language
+
+
+COMMENT_THREAD_CACHE_TIMEOUT = 24 * 60 * 60
+COMMENT_THREAD_VARIANTS = ("anonymous", "user", "superuser")
+
+# the holes are prefixed by a random sentinel drawn for each cache fill, so
+# that the text of a comment cannot contain them
+CSRF_TOKEN_HOLE = "csrftoken"
+USER_PK_HOLE = "userpk"
+USERNAME_HOLE = "username"
+
+# stands in for the visitor while the cached thread is rendered
+CommentViewer = namedtuple(
+    "CommentViewer", ["is_authenticated", "is_superuser", "pk", "username"]
+    )
+
+
+def comment_thread_cache_key(article_id, language, variant):
+    return "comments:thread:{}:{}:{}".format(article_id, language, variant)
+
+
+def invalidate_comment_thread(article_id):
+    """
+    Drops the rendered comment thread of an article.
+    """
+    cache.delete_many(
+        [
+            comment_thread_cache_key(article_id, language, variant)
+            for language, _ in settings.LANGUAGES
+            for variant in COMMENT_THREAD_VARIANTS
+            ]
+        )
+
+
+def get_viewer_variant(user):
+    if user.is_superuser:
+        return "superuser"
+    if user.is_authenticated:
+        return "user"
+    return "anonymous"
+
+
+def render_comment_thread(article, user, csrf_token):
+    """
+    Renders the comments of an article with their reply forms. The thread is
+    rendered once per article, language and kind of visitor, the CSRF token
+    and the visitor's name are filled in on every call.
+    """
+    variant = get_viewer_variant(user)
+    key = comment_thread_cache_key(article.pk, get_language(), variant)
+    cached = cache.get(key)
+    if cached is None:
+        sentinel = secrets.token_hex(16)
+        viewer = CommentViewer(
+            is_authenticated=variant != "anonymous",
+            is_superuser=variant == "superuser",
+            pk=sentinel + USER_PK_HOLE,
+            username=sentinel + USERNAME_HOLE,
+            )
+        content = render_to_string(
+            "aldryn_newsblog/includes/comments.html",
+            {
+                "thread": article.get_comment_thread(),
+                "article": article,
+                "user": viewer,
+                "csrf_token": sentinel + CSRF_TOKEN_HOLE,
+                "recaptcha_site_key": settings.RECAPTCHA_PUBLIC_KEY,
+                },
+            )
+        cached = (sentinel, content)
+        cache.set(key, cached, COMMENT_THREAD_CACHE_TIMEOUT)
+
+    sentinel, content = cached
+    content = content.replace(sentinel + CSRF_TOKEN_HOLE, escape(csrf_token))
+    if variant != "anonymous":
+        content = content.replace(sentinel + USER_PK_HOLE, str(user.pk))
+        content = content.replace(sentinel + USERNAME_HOLE, escape(user.username))
+    return content
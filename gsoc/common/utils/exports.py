@@ -0,0 +1,177 @@
+import csv
+from abc import ABC, abstractmethod
+from collections import namedtuple
+
+from django.conf import settings
+from django.db.models import Case, OuterRef, Q, Subquery, When
+
+from aldryn_newsblog.models import Article
+
+from gsoc.models import ArticleReview, GsocYear, RegLink, UserProfile
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+ROLE_NAMES = dict(UserProfile.ROLES)
+
+# `lookup` is passed to values_list, `display` formats the fetched value
+ExportColumn = namedtuple("ExportColumn", ["name", "header", "lookup", "display"])
+
+
+def column(name, header, lookup=None, display=None):
+    return ExportColumn(name, header, lookup or name, display)
+
+
+def yes_no(value):
+    return "Yes" if value else "No"
+
+
+class Echo:
+    """
+    A file-like object returning what is written to it, lets `csv.writer`
+    format the rows one at a time for a streaming response.
+    """
+
+    def write(self, value):
+        return value
+
+
+class Export(ABC):
+    """
+    Streams rows of a queryset as csv without loading it at once. The
+    columns are fetched with a single `values_list` query, following the
+    relations in the database instead of once per row.
+    """
+
+    name = None
+    columns = []
+    default_columns = None
+    year_lookup = "gsoc_year"
+
+    @abstractmethod
+    def get_queryset(self):
+        """
+        Returns the queryset exported, ordered.
+        """
+
+    def filter_years(self, queryset, years):
+        return queryset.filter(**{f"{self.year_lookup}__in": years})
+
+    def get_columns(self, names=None):
+        """
+        Returns the columns for `names`, all or the default ones if empty,
+        raises KeyError for an unknown column.
+        """
+        columns = {c.name: c for c in self.columns}
+        names = names or self.default_columns or list(columns)
+        return [columns[name] for name in names]
+
+    def rows(self, columns, years=None):
+        queryset = self.get_queryset()
+        if years:
+            queryset = self.filter_years(queryset, years)
+        values = queryset.values_list(*[c.lookup for c in columns])
+        for row in values.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            yield [
+                c.display(value) if c.display else value
+                for c, value in zip(columns, row)
+                ]
+
+    def stream(self, columns, years=None):
+        writer = csv.writer(Echo())
+        yield writer.writerow([c.header for c in columns])
+        for row in self.rows(columns, years):
+            yield writer.writerow(row)
+
+
+class ProfileExport(Export):
+    roles = ()
+    columns = [
+        column("user", "User", "user__username"),
+        column("email", "Email", "user__email"),
+        column("name", "Name", "user__first_name"),
+        column("suborg", "Suborg", "suborg_full_name__suborg_name"),
+        column("role", "Role", display=ROLE_NAMES.get),
+        column("year", "Year", "gsoc_year_id"),
+        column("github", "GitHub", "github_handle"),
+        column("blog", "Blog", "app_config__namespace"),
+        column("blog_posts_due", "Blog posts due", "current_blog_count"),
+        column("proposal_confirmed", "Proposal confirmed", display=yes_no),
+        ]
+    default_columns = ["user", "email", "suborg", "role"]
+
+    def get_queryset(self):
+        return UserProfile.objects.filter(role__in=self.roles).order_by("-id")
+
+
+class MentorExport(ProfileExport):
+    name = "mentors"
+    roles = (1, 2)
+
+
+class StudentExport(ProfileExport):
+    name = "students"
+    roles = (3,)
+
+
+class SuborgAdminExport(ProfileExport):
+    name = "suborg_admins"
+    roles = (1,)
+
+
+class RegLinkExport(Export):
+    name = "reglinks"
+    columns = [
+        column("email", "Email"),
+        column("role", "Role", "user_role", ROLE_NAMES.get),
+        column("suborg", "Suborg", "user_suborg__suborg_name"),
+        column("year", "Year", "gsoc_year_id"),
+        column("created_at", "Created at"),
+        column("is_used", "Used", display=yes_no),
+        column("url", "Registration link", "reglink_id", lambda id: RegLink(reglink_id=id).url),
+        ]
+    default_columns = ["email", "role", "suborg", "year", "created_at", "is_used"]
+
+    def get_queryset(self):
+        return RegLink.objects.order_by("-id")
+
+
+class ArticleReviewExport(Export):
+    name = "article_reviews"
+    columns = [
+        column("title", "Title"),
+        column("blog", "Blog", "article__app_config__namespace"),
+        column("owner", "Owner", "article__owner__username"),
+        column("published_at", "Published at", "article__publishing_date"),
+        column("is_published", "Published", "article__is_published", yes_no),
+        column("is_reviewed", "Reviewed", display=yes_no),
+        column("reviewed_by", "Reviewed by", "last_reviewed_by__username"),
+        ]
+
+    def get_queryset(self):
+        # the title in the default language, or any other one
+        titles = Article._parler_meta.root_model.objects.filter(
+            master=OuterRef("article_id")
+            ).order_by(Case(When(language_code=settings.LANGUAGE_CODE, then=0), default=1))
+        return ArticleReview.objects.annotate(
+            title=Subquery(titles.values("title")[:1])
+            ).order_by("-article__publishing_date")
+
+    def filter_years(self, queryset, years):
+        published = Q()
+        for year in years:
+            start, end = GsocYear(gsoc_year=year).get_bounds()
+            published |= Q(article__publishing_date__gte=start, article__publishing_date__lt=end)
+        return queryset.filter(published)
+
+
+EXPORTS = {
+    export.name: export()
+    for export in (
+        MentorExport,
+        StudentExport,
+        SuborgAdminExport,
+        RegLinkExport,
+        ArticleReviewExport,
+        )
+    }
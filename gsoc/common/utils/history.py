@@ -0,0 +1,47 @@
+import difflib
+import hashlib
+import json
+import re
+import zlib
+
+
+# html is mostly on a single line, diff it tag by tag instead
+TOKEN_RE = re.compile(r"(?<=>)|(?<=\n)")
+
+
+def content_hash(content):
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def tokenize(content):
+    return [token for token in TOKEN_RE.split(content) if token]
+
+
+def diff_content(old, new):
+    """
+    Returns the compressed changes turning `old` into `new`: a list of
+    [start, end] slices of the old tokens to copy and strings to insert.
+    """
+    old_tokens, new_tokens = tokenize(old), tokenize(new)
+    matcher = difflib.SequenceMatcher(None, old_tokens, new_tokens, autojunk=False)
+    ops = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j1 != j2:
+            ops.append("".join(new_tokens[j1:j2]))
+    return zlib.compress(json.dumps(ops, separators=(",", ":")).encode())
+
+
+def patch_content(old, diff):
+    """
+    Applies the changes returned by `diff_content` to `old`.
+    """
+    old_tokens = tokenize(old)
+    parts = []
+    for op in json.loads(zlib.decompress(diff).decode()):
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.extend(old_tokens[op[0]:op[1]])
+    return "".join(parts)
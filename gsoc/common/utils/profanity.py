@@ -0,0 +1,35 @@
+import re
+
+from profanityfilter import ProfanityFilter
+from profanityfilter.profanityfilter import ENDS_WITH_WORD_CHAR, STARTS_WITH_WORD_CHAR
+
+
+class CompiledProfanityFilter(ProfanityFilter):
+    """
+    A ProfanityFilter that looks for all the profane words with a single
+    regex compiled once, instead of compiling one regex per word and call.
+    The word lists are read when the filter is created.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._matcher = self.compile_matcher()
+
+    def compile_matcher(self):
+        patterns = []
+        # longest words first, as in ProfanityFilter.censor
+        for word in self.get_profane_words():
+            if not self._no_word_boundaries:
+                if STARTS_WITH_WORD_CHAR.search(word):
+                    word = r"\b" + word
+                if ENDS_WITH_WORD_CHAR.search(word):
+                    word = word + r"\b"
+            patterns.append(word)
+        return re.compile("|".join(patterns), re.IGNORECASE)
+
+    def has_bad_word(self, text):
+        return self._matcher.search(text) is not None
+
+
+# loaded with the module, shared by every request of the process
+profanity_filter = CompiledProfanityFilter()
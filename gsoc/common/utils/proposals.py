@@ -0,0 +1,141 @@
+import hashlib
+import io
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+
+from pdfminer.converter import TextConverter
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+
+from gsoc.models import ProposalTextValidator
+
+
+logger = logging.getLogger(__name__)
+
+PROPOSAL_SCAN_CACHE_TIMEOUT = 7 * 24 * 60 * 60
+# a scan lost with its process is started again by the next poll after this
+PROPOSAL_SCAN_PENDING_TIMEOUT = 10 * 60
+# a failure is kept only for the polling page, the next upload scans again
+PROPOSAL_SCAN_FAILED_TIMEOUT = 60
+
+NO_PRIVATE_DATA = {"emails": [], "possible_phone_numbers": [], "locations": []}
+
+
+def proposal_scan_cache_key(digest):
+    return "proposals:scan:{}".format(digest)
+
+
+def file_hash(f):
+    digest = hashlib.sha256()
+    f.seek(0)
+    for chunk in iter(lambda: f.read(64 * 1024), b""):
+        digest.update(chunk)
+    f.seek(0)
+    return digest.hexdigest()
+
+
+def iter_pdf_pages(f):
+    """
+    Yields the text of the pages of a pdf, extracting each page only when
+    the next one is asked for.
+    """
+    rsrcmgr = PDFResourceManager()
+    output = io.StringIO()
+    device = TextConverter(rsrcmgr, output, laparams=None)
+    interpreter = PDFPageInterpreter(rsrcmgr, device)
+    try:
+        for page in PDFPage.get_pages(f, check_extractable=True):
+            interpreter.process_page(page)
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
+    finally:
+        device.close()
+
+
+def extract_pdf_text(f, max_pages, time_budget):
+    """
+    Returns the text of the pages read within `max_pages` and `time_budget`
+    seconds, and whether reading stopped early because of them.
+    """
+    deadline = time.monotonic() + time_budget
+    pages = []
+    for text in iter_pdf_pages(f):
+        pages.append(text)
+        if len(pages) >= max_pages or time.monotonic() > deadline:
+            return "".join(pages), True
+    return "".join(pages), False
+
+
+def scan_proposal_file(f):
+    """
+    Returns the private data found in the text of a pdf proposal.
+    """
+    text, truncated = extract_pdf_text(
+        f, settings.PROPOSAL_SCAN_MAX_PAGES, settings.PROPOSAL_SCAN_TIME_BUDGET
+        )
+    result = {"status": "done", "private_data": NO_PRIVATE_DATA, "truncated": truncated}
+    try:
+        ProposalTextValidator().validate(text)
+    except ValidationError as err:
+        result["private_data"] = err.message_dict
+    return result
+
+
+def run_proposal_scan(name, digest):
+    key = proposal_scan_cache_key(digest)
+    try:
+        with default_storage.open(name, "rb") as f:
+            result = scan_proposal_file(f)
+    except Exception:
+        logger.exception("Could not scan the proposal %s", name)
+        cache.set(key, {"status": "failed"}, PROPOSAL_SCAN_FAILED_TIMEOUT)
+    else:
+        cache.set(key, result, PROPOSAL_SCAN_CACHE_TIMEOUT)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.PROPOSAL_SCAN_WORKERS,
+                    thread_name_prefix="proposal-scan",
+                    )
+    return _executor
+
+
+def start_proposal_scan(field_file):
+    """
+    Scans a saved proposal in the background unless a file with the same
+    content was scanned successfully before, returns the id to poll the
+    result with.
+    """
+    with field_file.open("rb") as f:
+        digest = file_hash(f)
+    key = proposal_scan_cache_key(digest)
+    if (cache.get(key) or {}).get("status") == "failed":
+        cache.delete(key)
+    # only the first request for a content starts a scan
+    if cache.add(key, {"status": "pending"}, PROPOSAL_SCAN_PENDING_TIMEOUT):
+        get_executor().submit(run_proposal_scan, field_file.name, digest)
+    return digest
+
+
+def get_proposal_scan(digest):
+    """
+    Returns the state of a scan, None if it is unknown.
+    """
+    return cache.get(proposal_scan_cache_key(digest))
@@ -0,0 +1,159 @@
+import logging
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+
+logger = logging.getLogger(__name__)
+
+RECAPTCHA_VERIFY_URL = "https://www.google.com/recaptcha/api/siteverify"
+
+RECAPTCHA_STATS_KEYS = {
+    "passed": "recaptcha:passed",
+    "failed": "recaptcha:failed",
+    "unavailable": "recaptcha:unavailable",
+    "latency": "recaptcha:latency_ms",
+    }
+
+
+class RecaptchaUnavailable(Exception):
+    """
+    Raised when the verification service can not be reached or the circuit
+    breaker is open.
+    """
+
+
+def get_recaptcha_stats():
+    """
+    Returns the number of passed, failed and unavailable verifications and
+    their total latency in milliseconds.
+    """
+    stats = cache.get_many(RECAPTCHA_STATS_KEYS.values())
+    return {name: stats.get(key, 0) for name, key in RECAPTCHA_STATS_KEYS.items()}
+
+
+def record_verification(outcome, elapsed):
+    for name, value in ((outcome, 1), ("latency", int(elapsed * 1000))):
+        key = RECAPTCHA_STATS_KEYS[name]
+        cache.add(key, 0, None)
+        cache.incr(key, value)
+    logger.info("reCAPTCHA verification %s in %.1f ms", outcome, elapsed * 1000)
+
+
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive failures and lets a single trial call
+    through once `recovery_timeout` seconds have passed.
+    """
+
+    def __init__(self, threshold, recovery_timeout):
+        self.threshold = threshold
+        self.recovery_timeout = recovery_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.recovery_timeout:
+                # half open, the next failure opens it again right away
+                self.opened_at = None
+                self.failures = self.threshold - 1
+                return True
+            return False
+
+    def succeeded(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def failed(self):
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+class RecaptchaVerifier:
+    """
+    Verifies reCAPTCHA responses against Google's siteverify endpoint over
+    a pooled session with strict timeouts.
+    """
+
+    def __init__(self):
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=10))
+        self.timeout = tuple(settings.RECAPTCHA_TIMEOUT)
+        self.breaker = CircuitBreaker(
+            settings.RECAPTCHA_FAILURE_THRESHOLD, settings.RECAPTCHA_RECOVERY_TIMEOUT
+            )
+
+    def check(self, response, remote_ip=None):
+        if not self.breaker.allow():
+            raise RecaptchaUnavailable("circuit open")
+        payload = {"secret": settings.RECAPTCHA_PRIVATE_KEY, "response": response}
+        if remote_ip:
+            payload["remoteip"] = remote_ip
+        try:
+            result = self.session.post(RECAPTCHA_VERIFY_URL, data=payload, timeout=self.timeout)
+            result.raise_for_status()
+            success = bool(result.json()["success"])
+        except (requests.RequestException, ValueError, KeyError) as e:
+            self.breaker.failed()
+            raise RecaptchaUnavailable(str(e))
+        self.breaker.succeeded()
+        return success
+
+    def verify(self, response, remote_ip=None):
+        """
+        Returns whether the response passed the challenge, raises
+        `RecaptchaUnavailable` if it could not be checked.
+        """
+        started = time.monotonic()
+        try:
+            success = self.check(response, remote_ip)
+        except RecaptchaUnavailable as e:
+            logger.warning("reCAPTCHA verification unavailable: %s", e)
+            record_verification("unavailable", time.monotonic() - started)
+            raise
+        record_verification("passed" if success else "failed", time.monotonic() - started)
+        return success
+
+
+class FakeRecaptchaVerifier(RecaptchaVerifier):
+    """
+    Verifies locally for tests and development: any response passes except
+    an empty one and `FAILING_RESPONSE`.
+    """
+
+    FAILING_RESPONSE = "fail"
+
+    def __init__(self):
+        pass
+
+    def check(self, response, remote_ip=None):
+        return bool(response) and response != self.FAILING_RESPONSE
+
+
+_verifier = None
+_verifier_lock = threading.Lock()
+
+
+def get_recaptcha_verifier():
+    """
+    Returns the process-wide verifier configured by `RECAPTCHA_VERIFIER`.
+    """
+    global _verifier
+    if _verifier is None:
+        with _verifier_lock:
+            if _verifier is None:
+                _verifier = import_string(settings.RECAPTCHA_VERIFIER)()
+    return _verifier
@@ -0,0 +1,62 @@
+import bisect
+import datetime
+import threading
+
+import pytz
+
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def format_offset(offset):
+    """
+    Formats a UTC offset like the end of `str(datetime)`, e.g. "+05:30".
+    """
+    minutes = int(offset.total_seconds()) // 60
+    sign = "-" if minutes < 0 else "+"
+    return "{}{:02d}:{:02d}".format(sign, *divmod(abs(minutes), 60))
+
+
+class TimeZoneIndex:
+    """
+    Maps the wall-clock offsets of `pytz.common_timezones`, in minutes modulo
+    a day, to the first zone in that list currently having it. The index is
+    rebuilt once the next DST transition of any of the zones has passed.
+    """
+
+    def __init__(self):
+        self.offsets = {}
+        self.valid_until = datetime.datetime.min
+        self.lock = threading.Lock()
+
+    def build(self, now):
+        offsets = {}
+        valid_until = datetime.datetime.max
+        naive_now = now.replace(tzinfo=None)
+        for name in pytz.common_timezones:
+            zone = pytz.timezone(name)
+            offset = now.astimezone(zone).utcoffset()
+            key = int(offset.total_seconds()) // 60 % MINUTES_PER_DAY
+            offsets.setdefault(key, (name, format_offset(offset)))
+
+            transitions = getattr(zone, "_utc_transition_times", None)
+            if transitions:
+                i = bisect.bisect_right(transitions, naive_now)
+                if i < len(transitions):
+                    valid_until = min(valid_until, transitions[i])
+        self.offsets, self.valid_until = offsets, valid_until
+
+    def lookup(self, offset_minutes, now=None):
+        """
+        Returns the (zone name, offset) of the first zone whose clock is
+        `offset_minutes` ahead of UTC, or None.
+        """
+        now = now or datetime.datetime.now(tz=pytz.utc)
+        if now.replace(tzinfo=None) >= self.valid_until:
+            with self.lock:
+                if now.replace(tzinfo=None) >= self.valid_until:
+                    self.build(now)
+        return self.offsets.get(offset_minutes % MINUTES_PER_DAY)
+
+
+time_zone_index = TimeZoneIndex()
@@ -0,0 +1,231 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageOps
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+logger = logging.getLogger(__name__)
+
+UPLOADS_DIR = "uploads"
+RENDITIONS_CACHE_TIMEOUT = 24 * 60 * 60
+RENDITIONS_PENDING_TIMEOUT = 10 * 60
+
+# gifs are left alone, resizing would drop their animation
+RESIZABLE_EXTENSIONS = {"jpg", "jpeg", "png", "webp"}
+
+UPLOADED_IMG_RE = re.compile(
+    r'<img\b[^>]*?\bsrc="{}{}/[0-9a-f]{{2}}/(?P<digest>[0-9a-f]{{64}})\.\w+"[^>]*>'.format(
+        re.escape(settings.MEDIA_URL), UPLOADS_DIR
+        )
+    )
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+def upload_extension(filename):
+    extension = os.path.splitext(filename)[1][1:].lower()
+    return extension if re.fullmatch(r"[a-z0-9]{1,10}", extension) else "bin"
+
+
+def upload_name(digest, extension):
+    return "{}/{}/{}.{}".format(UPLOADS_DIR, digest[:2], digest, extension)
+
+
+def rendition_name(digest, width):
+    return "{}/{}/{}-{}w.webp".format(UPLOADS_DIR, digest[:2], digest, width)
+
+
+def manifest_name(digest):
+    return "{}/{}/{}.json".format(UPLOADS_DIR, digest[:2], digest)
+
+
+def media_path(name):
+    return os.path.join(settings.MEDIA_ROOT, name)
+
+
+def media_url(name):
+    return settings.MEDIA_URL + name
+
+
+def renditions_cache_key(digest):
+    return "uploads:renditions:{}".format(digest)
+
+
+def store_upload(file):
+    """
+    Streams an uploaded file to disk while hashing it and stores it under its
+    content hash, an identical file uploaded before is reused. Returns the
+    name of the stored file in the media directory and its hash.
+    """
+    if file.size > settings.UPLOAD_MAX_SIZE:
+        raise UploadTooLarge("Files must be smaller than {} MB.".format(settings.UPLOAD_MAX_SIZE // 2 ** 20))
+    directory = media_path(UPLOADS_DIR)
+    os.makedirs(directory, exist_ok=True)
+
+    sha = hashlib.sha256()
+    with tempfile.NamedTemporaryFile(dir=directory, delete=False) as destination:
+        try:
+            for chunk in file.chunks():
+                sha.update(chunk)
+                destination.write(chunk)
+        except BaseException:
+            os.unlink(destination.name)
+            raise
+
+    digest = sha.hexdigest()
+    name = upload_name(digest, upload_extension(file.name))
+    path = media_path(name)
+    if os.path.exists(path):
+        os.unlink(destination.name)
+    else:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.chmod(destination.name, 0o644)
+        os.replace(destination.name, path)
+    return name, digest
+
+
+def get_rendition_widths(width):
+    """
+    Returns the widths of the renditions of an image `width` pixels wide: the
+    smaller steps of `UPLOAD_IMAGE_WIDTHS` and the full width.
+    """
+    return [w for w in settings.UPLOAD_IMAGE_WIDTHS if w < width] + [width]
+
+
+def save_image(image, path, **kwargs):
+    # written aside and moved, pages never link a half written file
+    directory, filename = os.path.split(path)
+    with tempfile.NamedTemporaryFile(dir=directory, suffix=filename, delete=False) as f:
+        image.save(f, **kwargs)
+    os.chmod(f.name, 0o644)
+    os.replace(f.name, path)
+
+
+def build_renditions(name, digest):
+    """
+    Writes the WebP renditions of an uploaded image and their manifest.
+    """
+    with Image.open(media_path(name)) as image:
+        if getattr(image, "is_animated", False):
+            return
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+        width, height = image.size
+        renditions = {}
+        for w in get_rendition_widths(width):
+            resized = image if w == width else image.resize(
+                (w, max(1, round(height * w / width))), Image.LANCZOS
+                )
+            rendition = rendition_name(digest, w)
+            save_image(resized, media_path(rendition), format="WEBP", quality=settings.UPLOAD_WEBP_QUALITY)
+            renditions[w] = rendition
+
+    manifest = {"width": width, "renditions": renditions}
+    with open(media_path(manifest_name(digest)), "w") as f:
+        json.dump(manifest, f)
+    cache.set(renditions_cache_key(digest), manifest, RENDITIONS_CACHE_TIMEOUT)
+
+
+def run_build_renditions(name, digest):
+    try:
+        build_renditions(name, digest)
+    except Exception:
+        logger.exception("Could not build the renditions of %s", name)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.UPLOAD_RENDITION_WORKERS,
+                    thread_name_prefix="upload-renditions",
+                    )
+    return _executor
+
+
+def get_renditions(digest):
+    """
+    Returns the manifest of the renditions of an upload, None until they
+    were built.
+    """
+    key = renditions_cache_key(digest)
+    manifest = cache.get(key)
+    if manifest is None:
+        try:
+            with open(media_path(manifest_name(digest))) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        manifest["renditions"] = {int(w): name for w, name in manifest["renditions"].items()}
+        cache.set(key, manifest, RENDITIONS_CACHE_TIMEOUT)
+    return manifest
+
+
+def plan_renditions(name, digest):
+    """
+    Starts building the renditions of an uploaded image in the background,
+    returns the names they will have by width, empty if there will be none.
+    """
+    if upload_extension(name) not in RESIZABLE_EXTENSIONS:
+        return {}
+    manifest = get_renditions(digest)
+    if manifest is not None:
+        return manifest["renditions"]
+    try:
+        with Image.open(media_path(name)) as image:
+            # the size is read from the header, the pixels are not decoded
+            width, height = image.size
+            if getattr(image, "is_animated", False):
+                return {}
+            if image.getexif().get(0x0112, 1) > 4:
+                # rotated a quarter by its exif orientation
+                width = height
+    except Exception:
+        return {}
+    if cache.add("{}:pending".format(renditions_cache_key(digest)), True, RENDITIONS_PENDING_TIMEOUT):
+        get_executor().submit(run_build_renditions, name, digest)
+    return {w: rendition_name(digest, w) for w in get_rendition_widths(width)}
+
+
+def build_srcset(renditions):
+    return ", ".join("{} {}w".format(media_url(name), w) for w, name in sorted(renditions.items()))
+
+
+def add_upload_srcset(instance, placeholder, rendered_content, original_context):
+    """
+    CMS plugin processor adding the srcset of their WebP renditions to the
+    uploaded images of a plugin, once the renditions were built.
+    """
+    if UPLOADS_DIR not in rendered_content:
+        return rendered_content
+
+    def add_srcset(match):
+        tag = match.group(0)
+        manifest = None if "srcset=" in tag else get_renditions(match.group("digest"))
+        if not manifest:
+            return tag
+        end = len(tag) - 2 if tag.endswith("/>") else len(tag) - 1
+        attrs = ' srcset="{}" sizes="(max-width: {width}px) 100vw, {width}px"'.format(
+            build_srcset(manifest["renditions"]), width=manifest["width"]
+            )
+        return tag[:end].rstrip() + attrs + tag[end:]
+
+    return UPLOADED_IMG_RE.sub(add_srcset, rendered_content)
@@ -1,8 +1,4 @@
-from aldryn_newsblog.cms_appconfig import NewsBlogConfig
-
-from cms.models import Title, Page
-
-from django.urls import reverse
+from gsoc.common.utils.blogs import get_blog_by_namespace
 
 from .settings import RECAPTCHA_PUBLIC_KEY
 
@@ -13,14 +9,7 @@ def recaptcha_site_key(request):
 
 def blog_slug(request):
     if hasattr(request, "current_app"):
-        namespace = request.current_app
-        try:
-            page = Page.objects.get(
-                application_namespace=namespace, publisher_is_draft=False
-                )
-            slug = Title.objects.get(page=page).slug
-            feed_url = reverse("blogs_list:blog_feed", kwargs={"blog_slug": slug})
-            return {"feed_url": feed_url}
-        except Exception as e:
-            return {}
+        blog = get_blog_by_namespace(request.current_app)
+        if blog is not None and blog.feed_url:
+            return {"feed_url": blog.feed_url}
     return {}
@@ -1,8 +1,12 @@
+import csv
+import datetime
 import re
 from PIL import Image
 
 from .models import (
+    AddUserLog,
     Generator,
+    GsocYear,
     GsocEndDateDefault,
     GsocStartDate,
     ArticleReview,
@@ -19,6 +23,7 @@ from .models import (
 
 from django import forms
 from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
 
 
 class UserProfileForm(forms.ModelForm):
@@ -53,6 +58,75 @@ class RegLinkForm(forms.ModelForm):
         fields = ("email", "user_role", "user_suborg", "gsoc_end_date", "gsoc_year")
 
 
+class AddUserLogForm(forms.ModelForm):
+    invites_csv = forms.FileField(
+        label="Invites CSV",
+        required=False,
+        help_text=(
+            "One invite per line: email, role, suborg, gsoc year and optionally "
+            "the gsoc end date (YYYY-MM-DD). Roles and suborgs may be given by "
+            "name or id."
+            ),
+        )
+
+    class Meta:
+        model = AddUserLog
+        fields = ()
+
+    def clean_invites_csv(self):
+        """
+        Parses the uploaded invites into unsaved RegLinks.
+        """
+        upload = self.cleaned_data.get("invites_csv")
+        if not upload:
+            return []
+        try:
+            lines = upload.read().decode("utf-8-sig").splitlines()
+        except UnicodeDecodeError:
+            raise ValidationError("The CSV file must be UTF-8 encoded.")
+
+        roles = {name.lower(): role for role, name in UserProfile.ROLES}
+        roles.update({str(role): role for role, _ in UserProfile.ROLES})
+        suborgs = {}
+        for suborg in SubOrg.objects.all():
+            suborgs[str(suborg.pk)] = suborgs[suborg.suborg_name.strip().lower()] = suborg
+        years = {str(year) for year in GsocYear.objects.get_years()}
+
+        reglinks, errors = [], []
+        for line, row in enumerate(csv.reader(lines), 1):
+            row = [value.strip() for value in row]
+            if not any(row) or row[0].lower() == "email":
+                continue
+            try:
+                if len(row) < 4:
+                    raise ValidationError("expected at least 4 columns")
+                email, role, suborg, year = row[:4]
+                validate_email(email)
+                if role.lower() not in roles:
+                    raise ValidationError(f"unknown role {role}")
+                if suborg.lower() not in suborgs:
+                    raise ValidationError(f"unknown suborg {suborg}")
+                if year not in years:
+                    raise ValidationError(f"unknown gsoc year {year}")
+                end_date = row[4] if len(row) > 4 and row[4] else None
+                reglinks.append(
+                    RegLink(
+                        email=email,
+                        user_role=roles[role.lower()],
+                        user_suborg=suborgs[suborg.lower()],
+                        gsoc_year_id=int(year),
+                        gsoc_end_date=end_date and datetime.date.fromisoformat(end_date),
+                        )
+                    )
+            except ValidationError as e:
+                errors.append(f"Line {line}: {'; '.join(e.messages)}")
+            except ValueError:
+                errors.append(f"Line {line}: invalid gsoc end date {row[4]}")
+        if errors:
+            raise ValidationError(errors)
+        return reglinks
+
+
 class BlogPostDueDateForm(forms.ModelForm):
     class Meta:
         model = BlogPostDueDate
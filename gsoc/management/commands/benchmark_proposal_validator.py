@@ -0,0 +1,183 @@
+import random
+import re
+import timeit
+
+import phonenumbers
+from phonenumbers.phonenumbermatcher import PhoneNumberMatcher
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+
+from gsoc.models import ProposalTextValidator
+
+
+class LegacyProposalTextValidator(ProposalTextValidator):
+    """
+    The validator before the precompiled patterns and pre-filters.
+    """
+
+    def find_all_emails(self, text):
+        quick_email_pattern = re.compile(
+            r"""
+        [a-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&'*+/=?^_`{|}~-]+)*@
+        (?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z0-9](?:[a-z0-9-]*[a-z0-9])?
+        """,
+            re.X,
+            )
+        emails = re.findall(quick_email_pattern, text)
+        real_emails = []
+        for email in emails:
+            try:
+                validate_email(email)
+                real_emails.append(email)
+            except BaseException:
+                pass
+        return real_emails
+
+    def find_all_possible_phone_numbers(self, text):
+        matcher = PhoneNumberMatcher(text, "US")
+        all_numbers = list(iter(matcher))
+        all_number_strings = [x.raw_string for x in all_numbers]
+        ptn = re.compile(r"\+?[0-9][0-9\(\)\-\ ]{3,}[0-9]", re.A | re.M)
+        maybe_numbers = re.findall(ptn, text)
+        for maybe_number in maybe_numbers:
+            if maybe_number in all_number_strings:
+                continue
+            try:
+                maybe_number_parsed = phonenumbers.parse(maybe_number)
+                if phonenumbers.is_possible_number(maybe_number_parsed):
+                    all_number_strings.append(maybe_number)
+            except BaseException:
+                pass
+        return all_number_strings
+
+
+WORDS = (
+    "the project will implement a new parser for the python grammar with unit tests "
+    "documentation and benchmarks mentors review every pull request before the "
+    "community bonding period students write weekly blog posts about their progress"
+    ).split()
+
+TIMELINE = [
+    "Week {week} (June {day} - June {end}): finish milestone {week}.",
+    "{day}/06/2023 - {end}/06/2023 implement the {word} module, about {hours} hours.",
+    "Deliverable {week}: {word} support, {hours}% of the tests passing.",
+    "Table {week}: {a} {b} {c} {d}",
+    "See issue #{issue} and pull request #{pr} on GitHub.",
+    "Version {week}.{day}.{end} was released with {issue} commits.",
+    ]
+
+PRIVATE_DATA = [
+    "Contact me at {name}@example.org",
+    "Email: {name}.{word}@university.edu",
+    "my mail is {Name}@Example.com",
+    "alias {digits}@mail.example.net",
+    "not an email {name}@localhost or {name}@@example.org",
+    "Phone: +1 (202) 555-{four}",
+    "call +1 202-555-{four} or 202.555.{four}",
+    "UK office +44 20 7946 {four}",
+    "Landline 0049 30 {four}{four}",
+    "Mobile (202) 555-{four}",
+    "＋１ ２０２ ５５５ ０１４３",
+    ]
+
+
+def build_corpus(count, seed):
+    """
+    Returns `count` proposal-like texts: prose, timelines full of dates and
+    figures, and in some of them emails and phone numbers in several forms.
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(count):
+        lines = []
+        for _ in range(rng.randint(20, 120)):
+            kind = rng.random()
+            values = {
+                "week": rng.randint(1, 12),
+                "day": rng.randint(1, 28),
+                "end": rng.randint(1, 28),
+                "hours": rng.randint(5, 40),
+                "issue": rng.randint(1, 99999),
+                "pr": rng.randint(1, 99999),
+                "a": rng.randint(0, 9999),
+                "b": rng.randint(0, 9999),
+                "c": rng.randint(0, 9999),
+                "d": rng.randint(0, 9999),
+                "four": rng.randint(1000, 9999),
+                "digits": rng.randint(10 ** 5, 10 ** 9),
+                "word": rng.choice(WORDS),
+                "name": rng.choice(WORDS),
+                "Name": rng.choice(WORDS).title(),
+                }
+            # a third of the proposals are clean, a few have no figures at all
+            if i % 3 and kind < 0.05:
+                lines.append(rng.choice(PRIVATE_DATA).format(**values))
+            elif i % 10 and kind < 0.3:
+                lines.append(rng.choice(TIMELINE).format(**values))
+            else:
+                lines.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 25))))
+        corpus.append("\n".join(lines))
+    return corpus
+
+
+class Command(BaseCommand):
+    help = "Compare ProposalTextValidator with the previous implementation on a sample corpus."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-n",
+            "--number",
+            default=200,
+            type=int,
+            help="Number of proposals in the corpus",
+            )
+        parser.add_argument(
+            "-r",
+            "--repeat",
+            default=3,
+            type=int,
+            help="Number of runs, the fastest one is reported",
+            )
+        parser.add_argument(
+            "-s",
+            "--seed",
+            default=0,
+            type=int,
+            help="Seed of the corpus",
+            )
+
+    def handle(self, *args, **options):
+        corpus = build_corpus(options["number"], options["seed"])
+        legacy, current = LegacyProposalTextValidator(), ProposalTextValidator()
+        methods = ("find_all_emails", "find_all_possible_phone_numbers")
+
+        for method in methods:
+            for text in corpus:
+                expected = getattr(legacy, method)(text)
+                if getattr(current, method)(text) != expected:
+                    raise CommandError("{} differs for:\n{}".format(method, text))
+        self.stdout.write(
+            "{} proposals, {} characters, same results".format(
+                len(corpus), sum(len(text) for text in corpus)
+                ),
+            ending="\n",
+            )
+
+        for method in methods:
+            timings = [
+                min(
+                    timeit.repeat(
+                        lambda: [getattr(validator, method)(text) for text in corpus],
+                        number=1,
+                        repeat=options["repeat"],
+                        )
+                    )
+                for validator in (legacy, current)
+                ]
+            self.stdout.write(
+                "{}: previous {:.1f} ms, current {:.1f} ms, {:.1f}x".format(
+                    method, timings[0] * 1000, timings[1] * 1000, timings[0] / timings[1]
+                    ),
+                ending="\n",
+                )
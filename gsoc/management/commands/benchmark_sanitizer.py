@@ -0,0 +1,98 @@
+import timeit
+
+import bleach
+from bleach.css_sanitizer import CSSSanitizer
+from bs4 import BeautifulSoup
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from gsoc.common.utils.sanitizer import clean_article_html
+
+
+PARAGRAPH = (
+    '<h2 class="title">Week {0}</h2>'
+    '<p style="color: #333; position: fixed">This week I worked on the '
+    '<a href="https://github.com/python-gsoc" onclick="track()">parser</a>, '
+    "<em>fixed</em> <code>bugs</code> and wrote <b>tests</b>.<script>x()</script></p>"
+    '<ul><li>first item</li><li>second <span class="note">item</span></li></ul>'
+    '<img src="/media/week{0}.png" alt="progress" width="400">'
+    )
+IFRAMES = (
+    '<iframe src="https://www.youtube.com/embed/{0}" width="560" height="315" '
+    'frameborder="0" allowfullscreen></iframe>'
+    '<iframe src="https://example.com/embed/{0}" width="560"></iframe>'
+    )
+
+
+def legacy_clean(lead_in):
+    """
+    The sanitizer Article.save used before: bleach, a second html5lib parse to
+    find the iframes and a bleach pass per foreign iframe.
+    """
+    css_sanitizer = CSSSanitizer(allowed_css_properties=settings.BLEACH_ALLOWED_STYLES)
+    attrs = dict(bleach.sanitizer.ALLOWED_ATTRIBUTES)
+    attrs.update(settings.BLEACH_ALLOWED_ATTRS)
+    lead_in = bleach.clean(
+        lead_in,
+        tags=settings.BLEACH_ALLOWED_TAGS,
+        attributes=attrs,
+        css_sanitizer=css_sanitizer,
+        )
+    soup = BeautifulSoup(lead_in, "html5lib")
+    for iframe_tag in soup.find_all("iframe"):
+        _ = iframe_tag.attrs.get("src", None)
+        if not (_ and "https://www.youtube.com/embed" in _):
+            iframe_text = str(iframe_tag)
+            lead_in = lead_in.replace(iframe_text, bleach.clean(iframe_text))
+    return lead_in
+
+
+def build_post(paragraphs):
+    return "".join(
+        PARAGRAPH.format(i) + (IFRAMES.format(i) if i % 10 == 0 else "")
+        for i in range(paragraphs)
+        )
+
+
+class Command(BaseCommand):
+    help = "Compare the article sanitizer with the previous implementation on large posts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-p",
+            "--paragraphs",
+            nargs="+",
+            default=[10, 100, 1000],
+            type=int,
+            help="Sizes of the generated posts, in paragraphs",
+            )
+        parser.add_argument(
+            "-r",
+            "--repeat",
+            default=5,
+            type=int,
+            help="Number of runs per post, the fastest one is reported",
+            )
+
+    def handle(self, *args, **options):
+        for paragraphs in options["paragraphs"]:
+            post = build_post(paragraphs)
+            legacy = min(
+                timeit.repeat(lambda: legacy_clean(post), number=1, repeat=options["repeat"])
+                )
+            current = min(
+                timeit.repeat(
+                    lambda: clean_article_html(post), number=1, repeat=options["repeat"]
+                    )
+                )
+            self.stdout.write(
+                "{} paragraphs ({} KB): previous {:.1f} ms, current {:.1f} ms, {:.1f}x".format(
+                    paragraphs,
+                    len(post) // 1024,
+                    legacy * 1000,
+                    current * 1000,
+                    legacy / current,
+                    ),
+                ending="\n",
+                )
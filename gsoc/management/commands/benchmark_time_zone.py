@@ -0,0 +1,105 @@
+import datetime
+import timeit
+
+import django.utils.timezone as tz
+import pytz
+
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from gsoc.common.utils.time_zones import TimeZoneIndex
+from gsoc.templatetags.app_tag import time_zone
+
+
+def legacy_time_zone(flag=0):
+    """
+    The time_zone tag before the offset index: it compared the local clock
+    with the clock of every common timezone.
+    """
+    gmtTime = "+00:00"
+    localTime = tz.now()
+    all_timezones = pytz.common_timezones
+    TIME_ZONE = "UTC"
+    for i in all_timezones:
+        timeZone = pytz.timezone(i)
+        timeFromUTC = str(datetime.datetime.now(tz=timeZone))[-6:]
+        time = datetime.datetime.now(tz=timeZone)
+        if time.hour == localTime.hour:
+            if abs(time.minute - localTime.minute) <= 1:
+                TIME_ZONE = i
+                gmtTime = timeFromUTC
+                break
+    if flag:
+        return gmtTime
+    else:
+        return TIME_ZONE
+
+
+class Command(BaseCommand):
+    help = "Compare the time_zone template tag with the previous implementation."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-z",
+            "--zones",
+            nargs="+",
+            default=["UTC", "Asia/Kolkata", "America/New_York", "Pacific/Auckland"],
+            help="Server time zones to measure the tag with",
+            )
+        parser.add_argument(
+            "-n",
+            "--number",
+            default=1000,
+            type=int,
+            help="Number of renders per run",
+            )
+        parser.add_argument(
+            "-r",
+            "--repeat",
+            default=5,
+            type=int,
+            help="Number of runs, the fastest one is reported",
+            )
+
+    def handle(self, *args, **options):
+        number, repeat = options["number"], options["repeat"]
+        build = min(
+            timeit.repeat(
+                lambda: TimeZoneIndex().build(datetime.datetime.now(tz=pytz.utc)),
+                number=1,
+                repeat=repeat,
+                )
+            )
+        self.stdout.write("Building the index: {:.1f} ms".format(build * 1000), ending="\n")
+
+        for zone in options["zones"]:
+            with override_settings(TIME_ZONE=zone):
+                results = (time_zone(None), time_zone(None, 1))
+                legacy_results = (legacy_time_zone(), legacy_time_zone(1))
+                legacy = min(
+                    timeit.repeat(
+                        lambda: (legacy_time_zone(), legacy_time_zone(1)),
+                        number=number,
+                        repeat=repeat,
+                        )
+                    )
+                current = min(
+                    timeit.repeat(
+                        lambda: (time_zone(None), time_zone(None, 1)),
+                        number=number,
+                        repeat=repeat,
+                        )
+                    )
+            self.stdout.write(
+                "{}: {} (previous {}), {} calls: previous {:.1f} ms, current {:.1f} ms, "
+                "{:.0f}x".format(
+                    zone,
+                    " ".join(results),
+                    " ".join(legacy_results),
+                    number,
+                    legacy * 1000,
+                    current * 1000,
+                    legacy / current,
+                    ),
+                ending="\n",
+                )
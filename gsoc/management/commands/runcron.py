@@ -170,6 +170,25 @@ class Command(BaseCommand):
             for scheduler in template_schedulers:
                 self.handle_process(scheduler)
 
+        comment_schedulers = list(
+            Scheduler.objects.filter(success=None, command="send_comment_notification")
+            )
+        if len(comment_schedulers) == 0:
+            self.stdout.write(
+                self.style.SUCCESS("No scheduled send_comment_notification tasks"),
+                ending="\n",
+                )
+        else:
+            errors = commands.send_comment_notifications(comment_schedulers)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    "Expanded {} comment notification(s), {} failed".format(
+                        len(comment_schedulers), len(errors)
+                        )
+                    ),
+                ending="\n",
+                )
+
         # generic handlers
         x = Scheduler.objects.filter(success=None, activation_date=None).all()
         y = Scheduler.objects.filter(success=None, activation_date__lte=today).all()
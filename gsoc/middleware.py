@@ -0,0 +1,145 @@
+import logging
+import re
+
+from django.contrib import messages
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.template.loader import render_to_string
+from django.utils.cache import patch_cache_control
+from django.utils.translation import get_language
+
+from gsoc.common.utils.blogs import BLOGS_CACHE_TIMEOUT, blog_page_cache_key
+from gsoc.models import GsocIdentity
+
+
+logger = logging.getLogger(__name__)
+
+NEWSBLOG_APP_NAME = "aldryn_newsblog"
+CACHED_QUERY_PARAMS = {"page"}
+
+CSRF_TOKEN_HOLE = "BLOGPAGECSRFTOKEN"
+MESSAGES_HOLE = "<!--messages--><!--/messages-->"
+MESSAGES_RE = re.compile(r"<!--messages-->.*?<!--/messages-->", re.DOTALL)
+
+PAGE_CACHE_HITS_KEY = "blogs:pages:hits"
+PAGE_CACHE_MISSES_KEY = "blogs:pages:misses"
+PAGE_CACHE_REPORT_EVERY = 100
+
+
+def get_page_cache_stats():
+    """
+    Returns the number of hits and misses of the blog page cache.
+    """
+    stats = cache.get_many([PAGE_CACHE_HITS_KEY, PAGE_CACHE_MISSES_KEY])
+    return stats.get(PAGE_CACHE_HITS_KEY, 0), stats.get(PAGE_CACHE_MISSES_KEY, 0)
+
+
+def record_page_cache_lookup(hit):
+    key = PAGE_CACHE_HITS_KEY if hit else PAGE_CACHE_MISSES_KEY
+    cache.add(key, 0, None)
+    cache.incr(key)
+    hits, misses = get_page_cache_stats()
+    if (hits + misses) % PAGE_CACHE_REPORT_EVERY == 0:
+        logger.info(
+            "Blog page cache: %d hits, %d misses, %.1f%% hit ratio",
+            hits,
+            misses,
+            100.0 * hits / (hits + misses),
+            )
+
+
+def fill_holes(request, content):
+    """
+    Puts the CSRF token and messages of the current visitor into a cached page.
+    """
+    content = content.replace(CSRF_TOKEN_HOLE, get_token(request))
+    if MESSAGES_HOLE in content:
+        fragment = render_to_string(
+            "partials/messages.html", {"messages": messages.get_messages(request)}
+            )
+        content = content.replace(
+            MESSAGES_HOLE, "<!--messages-->{}<!--/messages-->".format(fragment)
+            )
+    return content
+
+
+class BlogPageCacheMiddleware:
+    """
+    Caches the article list and detail pages of the blogs for anonymous
+    visitors, keyed by path, language and blog namespace. The pages are
+    cached without the visitor's CSRF token and messages, which are filled
+    in again on every response.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        key = getattr(request, "_blog_page_cache_key", None)
+        if key is None or not getattr(request, "_blog_page_hollow", False):
+            return response
+        if response.streaming:
+            return response
+
+        content = response.content.decode(response.charset)
+        if response.status_code == 200:
+            content = MESSAGES_RE.sub(MESSAGES_HOLE, content)
+            cache.set(key, (content, response["Content-Type"]), BLOGS_CACHE_TIMEOUT)
+        response.content = fill_holes(request, content)
+        patch_cache_control(response, private=True)
+        return response
+
+    def is_cacheable(self, request):
+        match = request.resolver_match
+        return (
+            request.method in ("GET", "HEAD")
+            and match is not None
+            and NEWSBLOG_APP_NAME in match.app_names
+            and match.url_name != "article-search"
+            and not match.url_name.endswith("-feed")
+            and set(request.GET) <= CACHED_QUERY_PARAMS
+            and not request.user.is_authenticated
+            )
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self.is_cacheable(request):
+            return None
+
+        key = blog_page_cache_key(
+            request.resolver_match.namespace, get_language(), request.get_full_path()
+            )
+        cached = cache.get(key)
+        record_page_cache_lookup(cached is not None)
+        if cached is None:
+            request._blog_page_cache_key = key
+            return None
+
+        content, content_type = cached
+        response = HttpResponse(fill_holes(request, content), content_type=content_type)
+        patch_cache_control(response, private=True)
+        return response
+
+    def process_template_response(self, request, response):
+        if getattr(request, "_blog_page_cache_key", None) and response.context_data is not None:
+            response.context_data["csrf_token"] = CSRF_TOKEN_HOLE
+            response.context_data["messages"] = []
+            request._blog_page_hollow = True
+        return response
+
+
+class GsocIdentityMiddleware:
+    """
+    Attaches a `GsocIdentity` to the signed in user, so that the profile
+    helpers patched on User query the profiles once per request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            user.gsoc_identity = GsocIdentity(user)
+        return self.get_response(request)
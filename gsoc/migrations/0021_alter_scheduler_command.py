@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-19 11:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gsoc', '0020_alter_builder_category'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='scheduler',
+            name='command',
+            field=models.CharField(choices=[('send_email', 'send_email'), ('send_irc_msg', 'send_irc_msg'), ('revoke_student_permissions', 'revoke_student_permissions'), ('send_reg_reminder', 'send_reg_reminder'), ('add_blog_counter', 'add_blog_counter'), ('update_site_template', 'update_site_template'), ('archive_gsoc_pages', 'archive_gsoc_pages'), ('update_search_data', 'update_search_data')], max_length=40),
+        ),
+    ]
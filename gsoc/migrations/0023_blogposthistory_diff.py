@@ -0,0 +1,28 @@
+# Generated by Django 3.2.25 on 2026-10-19 12:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gsoc', '0022_alter_scheduler_command'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogposthistory',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='blogposthistory',
+            name='diff',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='blogposthistory',
+            name='is_snapshot',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 3.2.25 on 2026-10-19 12:45
+
+from django.db import migrations, models
+
+
+def copy_schedulers(apps, schema_editor):
+    SendEmail = apps.get_model('gsoc', 'SendEmail')
+    Through = SendEmail.schedulers.through
+    Through.objects.bulk_create([
+        Through(sendemail_id=pk, scheduler_id=scheduler_id)
+        for pk, scheduler_id in SendEmail.objects.exclude(scheduler=None).values_list('pk', 'scheduler_id')
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gsoc', '0023_blogposthistory_diff'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sendemail',
+            name='schedulers',
+            field=models.ManyToManyField(blank=True, related_name='send_emails', to='gsoc.Scheduler'),
+        ),
+        migrations.RunPython(copy_schedulers, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='sendemail',
+            name='scheduler',
+        ),
+    ]
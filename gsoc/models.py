@@ -3,18 +3,17 @@ import re
 import datetime
 import uuid
 import json
-import bleach
+from collections import defaultdict
 from urllib.parse import urljoin
-from bleach.css_sanitizer import CSSSanitizer
 
-from bs4 import BeautifulSoup
+from django.db.models import F, Max, Q, Subquery
 from django.db.models.deletion import PROTECT
 
 from googleapiclient.discovery import build
 
 from django.contrib.auth.models import Permission
 from django.contrib import auth
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.contrib.auth.models import User
 from django.dispatch import receiver
 from django.core.exceptions import ValidationError
@@ -22,16 +21,19 @@ from django.utils.translation import gettext as _
 from django.utils.html import mark_safe
 from django.core.validators import validate_email
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.shortcuts import reverse
 from django.conf import settings
+from django.core.cache import cache
 
 from aldryn_apphooks_config.fields import AppHookConfigField
 
 from aldryn_newsblog.cms_appconfig import NewsBlogConfig
 from aldryn_newsblog.models import Article, Person
 
-from cms.models import Page, PagePermission
+from cms.models import Page, PagePermission, Placeholder
 from cms import api
+from cms.signals import post_placeholder_operation, post_publish, post_unpublish
 from cms.utils.conf import get_cms_setting
 from cms.utils.apphook_reload import mark_urlconf_as_changed
 
@@ -40,6 +42,16 @@ from phonenumbers.phonenumbermatcher import PhoneNumberMatcher
 
 from gsoc.common.utils.tools import build_send_mail_json
 from gsoc.common.utils.tools import build_send_reminder_json
+from gsoc.common.utils.sanitizer import clean_article_html
+from gsoc.common.utils.comments import invalidate_comment_thread
+from gsoc.common.utils.history import content_hash, diff_content, patch_content
+from gsoc.common.utils.blogs import (
+    invalidate_blogs,
+    invalidate_articles_feed,
+    invalidate_blog_directory,
+    invalidate_blog_pages,
+    invalidate_blog_sitemap,
+    )
 from gsoc.settings import PROPOSALS_PATH, BASE_DIR
 from settings_local import ADMINS
 
@@ -47,6 +59,10 @@ from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
 
 
+# How long edits of an article are collected before its search data is recomputed
+SEARCH_DATA_UPDATE_DELAY = datetime.timedelta(minutes=1)
+
+
 # Util Functions
 
 
@@ -55,7 +71,9 @@ def gen_uuid_str():
 
 
 def validate_date(value):
-    gsoc_year = GsocYear.objects.latest('gsoc_year')
+    gsoc_year = GsocYear.objects.get_current()
+    if gsoc_year is None:
+        return
     try:
         end_date = GsocEndDate.objects.get(
             date__contains=gsoc_year
@@ -93,10 +111,49 @@ def getCreds():
 NewsBlogConfig.__str__ = lambda self: self.app_title
 
 
+class GsocIdentity:
+    """
+    The GSoC profiles of a user for the current year and the latest GsocYear,
+    loaded with a single query the first time they are needed.
+    `GsocIdentityMiddleware` shares one per request between the User helpers.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.year = timezone.now().year
+
+    @cached_property
+    def latest_year(self):
+        gsoc_year = GsocYear.objects.get_current()
+        return gsoc_year.gsoc_year if gsoc_year else None
+
+    @cached_property
+    def profiles(self):
+        return list(
+            UserProfile.objects.filter(
+                user=self.user, gsoc_year_id__in=[self.year, self.latest_year]
+                )
+            .select_related("app_config")
+            .order_by("pk")
+            )
+
+    def get_profile(self, roles, year):
+        for profile in self.profiles:
+            if profile.role in roles and profile.gsoc_year_id == year:
+                return profile
+        return None
+
+
+def get_gsoc_identity(user):
+    identity = user.__dict__.get("gsoc_identity")
+    if identity is None or identity.year != timezone.now().year:
+        identity = GsocIdentity(user)
+    return identity
+
+
 def current_year_profile(self):
-    gsoc_year = GsocYear.objects.first()
-    profile = self.userprofile_set.filter(gsoc_year=gsoc_year, role__in=[1, 2, 3])
-    return profile.first() if len(profile) > 0 else None
+    identity = get_gsoc_identity(self)
+    return identity.get_profile((1, 2, 3), identity.latest_year)
 
 
 auth.models.User.add_to_class("current_year_profile", current_year_profile)
@@ -114,24 +171,14 @@ auth.models.User.add_to_class("has_proposal", has_proposal)
 
 
 def is_current_year_student(self):
-    profile = self.student_profile()
-    if not profile:
-        return False
-    year = profile.gsoc_year.gsoc_year
-    current_year = timezone.now().year
-    return current_year == year
+    return self.student_profile() is not None
 
 
 auth.models.User.add_to_class("is_current_year_student", is_current_year_student)
 
 
 def is_current_year_suborg_admin(self):
-    profile = self.suborg_admin_profile()
-    if not profile:
-        return False
-    year = profile.gsoc_year.gsoc_year
-    current_year = timezone.now().year
-    return current_year == year
+    return self.suborg_admin_profile() is not None
 
 
 auth.models.User.add_to_class(
@@ -139,21 +186,22 @@ auth.models.User.add_to_class(
     )
 
 
-def suborg_admin_profile(self, year=timezone.now().year):
-    gsoc_year = GsocYear.objects.filter(gsoc_year=year).first()
-    if gsoc_year is None:
-        return None
-    return self.userprofile_set.filter(role=1, gsoc_year=gsoc_year).first()
+def get_role_profile(user, role, year):
+    identity = get_gsoc_identity(user)
+    if year is None or year == identity.year:
+        return identity.get_profile((role,), identity.year)
+    return user.userprofile_set.filter(role=role, gsoc_year_id=year).first()
+
+
+def suborg_admin_profile(self, year=None):
+    return get_role_profile(self, 1, year)
 
 
 auth.models.User.add_to_class("suborg_admin_profile", suborg_admin_profile)
 
 
-def student_profile(self, year=timezone.now().year):
-    gsoc_year = GsocYear.objects.filter(gsoc_year=year).first()
-    if gsoc_year is None:
-        return None
-    return self.userprofile_set.filter(role=3, gsoc_year=gsoc_year).first()
+def student_profile(self, year=None):
+    return get_role_profile(self, 3, year)
 
 
 auth.models.User.add_to_class("student_profile", student_profile)
@@ -166,24 +214,35 @@ def get_root_comments(self):
 Article.add_to_class("get_root_comments", get_root_comments)
 
 
-def save(self, *args, **kwargs):
-    css_sanitizer = CSSSanitizer(allowed_css_properties=settings.BLEACH_ALLOWED_STYLES)
-    tags = settings.BLEACH_ALLOWED_TAGS
-    attrs = bleach.sanitizer.ALLOWED_ATTRIBUTES
-    attrs.update(settings.BLEACH_ALLOWED_ATTRS)
-    self.lead_in = bleach.clean(
-        self.lead_in, tags=tags, attributes=attrs, css_sanitizer=css_sanitizer
-        )
-    soup = BeautifulSoup(self.lead_in, "html5lib")
-    for iframe_tag in soup.find_all("iframe"):
-        _ = iframe_tag.attrs.get("src", None)
-        if not (_ and "https://www.youtube.com/embed" in _):
-            iframe_text = str(iframe_tag)
-            self.lead_in = self.lead_in.replace(iframe_text, bleach.clean(iframe_text))
+def get_comment_thread(self):
+    """
+    Returns the comments of the article in display order as (comment, opening)
+    pairs: a comment is opened before its replies and closed after them, and
+    the thread ends by closing the article itself as (None, False).
+    """
+    replies = defaultdict(list)
+    for comment in self.comment_set.order_by("pk"):
+        replies[comment.parent_id].append(comment)
+
+    thread = []
+    stack = [(None, iter(replies[None]))]
+    while stack:
+        parent, children = stack[-1]
+        comment = next(children, None)
+        if comment is None:
+            stack.pop()
+            thread.append((parent, False))
+        else:
+            thread.append((comment, True))
+            stack.append((comment, iter(replies[comment.pk])))
+    return thread
 
-    # Update the search index
-    if self.update_search_on_save:
-        self.search_data = self.get_search_data()
+
+Article.add_to_class("get_comment_thread", get_comment_thread)
+
+
+def save(self, *args, **kwargs):
+    self.lead_in = clean_article_html(self.lead_in)
 
     # Ensure there is an owner.
     if self.app_config.create_authors and self.author is None:
@@ -195,10 +254,34 @@ def save(self, *args, **kwargs):
     self.lead_in = mark_safe(self.lead_in)
     super(Article, self).save(*args, **kwargs)
 
+    # Update the search index
+    if self.update_search_on_save:
+        self.refresh_search_data()
+
 
 Article.save = save
 
 
+def refresh_search_data(self, language=None):
+    """
+    Schedules a recompute of the search data of all translations, unless one
+    is already pending, so that a burst of edits is handled once by runcron.
+    """
+    data = json.dumps({"article_id": self.pk})
+    pending = Scheduler.objects.filter(
+        command="update_search_data", success=None, data=data
+        )
+    if not pending.exists():
+        Scheduler.objects.create(
+            command="update_search_data",
+            activation_date=timezone.now() + SEARCH_DATA_UPDATE_DELAY,
+            data=data,
+            )
+
+
+Article.refresh_search_data = refresh_search_data
+
+
 # Models
 
 
@@ -238,6 +321,37 @@ class SubOrg(models.Model):
         return self.suborg_name
 
 
+GSOC_YEARS_CACHE_KEY = "gsoc:years"
+GSOC_YEARS_CACHE_TIMEOUT = 60 * 60
+
+
+class GsocYearManager(models.Manager):
+    def get_years(self):
+        """
+        Returns the configured years, latest first, cached until a GsocYear
+        is saved or deleted.
+        """
+        years = cache.get(GSOC_YEARS_CACHE_KEY)
+        if years is None:
+            years = list(
+                self.get_queryset().order_by("-gsoc_year").values_list("gsoc_year", flat=True)
+                )
+            cache.set(GSOC_YEARS_CACHE_KEY, years, GSOC_YEARS_CACHE_TIMEOUT)
+        return years
+
+    def get_current(self):
+        """
+        Returns the latest GsocYear, or None if there is none yet.
+        """
+        years = self.get_years()
+        return self.model.from_db(self.db, ["gsoc_year"], [years[0]]) if years else None
+
+    def get_by_year(self, year):
+        if year not in self.get_years():
+            raise self.model.DoesNotExist("GsocYear {} does not exist.".format(year))
+        return self.model.from_db(self.db, ["gsoc_year"], [year])
+
+
 class GsocYear(models.Model):
     class Meta:
         ordering = ["-gsoc_year"]
@@ -246,9 +360,20 @@ class GsocYear(models.Model):
                                     primary_key=True,
                                     validators=[validate_date])
 
+    objects = GsocYearManager()
+
     def __str__(self):
         return str(self.gsoc_year)
 
+    def get_bounds(self):
+        """
+        Returns the start of the year and the start of the next one.
+        """
+        return (
+            datetime.datetime(self.gsoc_year, 1, 1),
+            datetime.datetime(self.gsoc_year + 1, 1, 1),
+            )
+
 
 class SubOrgDetails(models.Model):
     suborg_admin = models.ForeignKey(
@@ -501,7 +626,7 @@ class UserProfile(models.Model):
             raise Exception("User must not be empty!")
         if self.role == 0 or self.role is None:
             raise Exception("User must have a role!")
-        if self.gsoc_year != GsocYear.objects.get(gsoc_year=datetime.datetime.now().year):
+        if self.gsoc_year_id != GsocYear.objects.get_by_year(datetime.datetime.now().year).gsoc_year:
             raise Exception("Not current year!")
         if self.suborg_full_name is None:
             raise Exception("Suborg must not be empty!")
@@ -582,6 +707,8 @@ class Scheduler(models.Model):
         ("add_blog_counter", "add_blog_counter"),
         ("update_site_template", "update_site_template"),
         ("archive_gsoc_pages", "archive_gsoc_pages"),
+        ("update_search_data", "update_search_data"),
+        ("send_comment_notification", "send_comment_notification"),
         )
 
     id = models.AutoField(primary_key=True)
@@ -752,9 +879,70 @@ class Event(models.Model):
 
 
 class BlogPostHistory(models.Model):
+    # a full copy is stored every SNAPSHOT_EVERY revisions, diffs in between
+    SNAPSHOT_EVERY = 10
+
     article = models.ForeignKey(Article, on_delete=models.CASCADE)
     timestamp = models.DateTimeField(auto_now_add=True)
+    # full copy of the content, only set on the revisions stored before diffs
     content = models.TextField(null=True, blank=True)
+    content_hash = models.CharField(max_length=64, blank=True, default="")
+    diff = models.BinaryField(null=True, blank=True)
+    is_snapshot = models.BooleanField(default=False)
+
+    @classmethod
+    def get_revisions(cls, article_id, last_pk=None):
+        """
+        Returns the revisions of an article from the latest full copy up to
+        `last_pk`, oldest first.
+        """
+        revisions = cls.objects.filter(article_id=article_id)
+        if last_pk is not None:
+            revisions = revisions.filter(pk__lte=last_pk)
+        snapshot = (
+            revisions.filter(Q(is_snapshot=True) | Q(content__isnull=False))
+            .order_by("-pk")
+            .values("pk")[:1]
+            )
+        return list(revisions.filter(pk__gte=Subquery(snapshot)).order_by("pk"))
+
+    @staticmethod
+    def replay(revisions):
+        content = ""
+        for revision in revisions:
+            if revision.content is not None:
+                content = revision.content
+            else:
+                content = patch_content(
+                    "" if revision.is_snapshot else content, revision.diff
+                    )
+        return content
+
+    def get_content(self):
+        return self.replay(self.get_revisions(self.article_id, self.pk))
+
+    @classmethod
+    def record(cls, article):
+        """
+        Stores the content of an article as a new revision, unless it is the
+        same as the latest one.
+        """
+        content = article.lead_in or ""
+        digest = content_hash(content)
+        revisions = cls.get_revisions(article.pk)
+        if revisions:
+            latest = revisions[-1]
+            if (latest.content_hash or content_hash(latest.content or "")) == digest:
+                return None
+
+        is_snapshot = not revisions or len(revisions) >= cls.SNAPSHOT_EVERY
+        previous = "" if is_snapshot else cls.replay(revisions)
+        return cls.objects.create(
+            article=article,
+            content_hash=digest,
+            diff=diff_content(previous, content),
+            is_snapshot=is_snapshot,
+            )
 
 
 class BlogPostDueDate(models.Model):
@@ -900,7 +1088,7 @@ class BlogPostDueDate(models.Model):
             pass
 
         # update title
-        gsoc_year = GsocYear.objects.latest('gsoc_year')
+        gsoc_year = GsocYear.objects.get_current()
         timeline = Timeline.objects.get(gsoc_year=gsoc_year)
         items = BlogPostDueDate.objects.filter(timeline=timeline)
         if self.category == 0:
@@ -1009,7 +1197,7 @@ class GsocEndDate(models.Model):
                 timeline=self.timeline
                 )
         try:
-            gsoc_year = GsocYear.objects.latest('gsoc_year')
+            gsoc_year = GsocYear.objects.get_current()
             scheduler = Scheduler.objects.get(
                 command="archive_gsoc_pages",
                 activation_date__contains=gsoc_year
@@ -1100,44 +1288,56 @@ class PageNotification(models.Model):
 
 
 class ProposalTextValidator:
+    email_pattern = re.compile(
+        """
+        [a-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\\.[a-z0-9!#$%&'*+/=?^_`{|}~-]+)*@
+        (?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\\.)+[a-z0-9](?:[a-z0-9-]*[a-z0-9])?
+        """,
+        re.X,
+        )
+    phone_pattern = re.compile(r"\+?[0-9][0-9\(\)\-\ ]{3,}[0-9]", re.A | re.M)
+    # any unicode digit, like libphonenumber
+    digit_pattern = re.compile(r"\d")
+
     def find_all_emails(self, text):
         """
         Returns all emails in the text in a list.
         """
-        quick_email_pattern = re.compile(
-            """
-        [a-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&'*+/=?^_`{|}~-]+)*@
-        (?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z0-9](?:[a-z0-9-]*[a-z0-9])?
-        """,
-            re.X,
-            )
-        emails = re.findall(quick_email_pattern, text)
+        if "@" not in text:
+            return []
+        valid = {}
         real_emails = []
-        for email in emails:
-            try:
-                validate_email(email)
+        for email in self.email_pattern.findall(text):
+            if email not in valid:
+                try:
+                    validate_email(email)
+                    valid[email] = True
+                except ValidationError:
+                    valid[email] = False
+            if valid[email]:
                 real_emails.append(email)
-            except BaseException:
-                pass
         return real_emails
 
     def find_all_possible_phone_numbers(self, text):
         """
         Returns all possible phone numbers in a list.
         """
+        # libphonenumber only matches text with digits in it
+        if not self.digit_pattern.search(text):
+            return []
         matcher = PhoneNumberMatcher(text, "US")
-        all_numbers = list(iter(matcher))
-        all_number_strings = [x.raw_string for x in all_numbers]
-        ptn = re.compile(r"\+?[0-9][0-9\(\)\-\ ]{3,}[0-9]", re.A | re.M)
-        maybe_numbers = re.findall(ptn, text)
-        for maybe_number in maybe_numbers:
-            if maybe_number in all_number_strings:
+        all_number_strings = [x.raw_string for x in matcher]
+        seen = set(all_number_strings)
+        for maybe_number in self.phone_pattern.findall(text):
+            # without a region only numbers starting with + can be parsed
+            if maybe_number in seen or not maybe_number.startswith("+"):
                 continue
+            seen.add(maybe_number)
             try:
                 maybe_number_parsed = phonenumbers.parse(maybe_number)
                 if phonenumbers.is_possible_number(maybe_number_parsed):
                     all_number_strings.append(maybe_number)
-            except BaseException:
+            except Exception:
                 pass
         return all_number_strings
 
@@ -1176,6 +1376,92 @@ class AddUserLog(models.Model):
         return self.log_id
 
 
+def bulk_create_with_pks(model, objs, field=None):
+    """
+    `bulk_create` which also sets the primary keys on backends not returning
+    them. They are read back among the rows above the last primary key
+    before the insert, through `field` if given, unique among `objs`, else
+    in insertion order, which holds within the transaction this runs in.
+    """
+    manager = model._default_manager
+    with transaction.atomic(using=manager.db, savepoint=False):
+        last_pk = manager.aggregate(last_pk=Max("pk"))["last_pk"] or 0
+        objs = manager.bulk_create(objs)
+        missing = [obj for obj in objs if obj.pk is None]
+        if not missing:
+            return objs
+        inserted = manager.filter(pk__gt=last_pk).order_by("pk")
+        if field:
+            by_value = {getattr(obj, field): obj for obj in missing}
+            for value, pk in inserted.filter(**{f"{field}__in": list(by_value)}).values_list(field, "pk"):
+                by_value[value].pk = pk
+        else:
+            pks = list(inserted.values_list("pk", flat=True))
+            if len(pks) != len(missing):
+                raise IntegrityError(
+                    "Could not read back the primary keys of the new {}.".format(
+                        model._meta.verbose_name_plural
+                        )
+                    )
+            for obj, pk in zip(missing, pks):
+                obj.pk = pk
+    for obj in missing:
+        obj._state.adding, obj._state.db = False, manager.db
+    return objs
+
+
+class RegLinkManager(models.Manager):
+    def bulk_invite(self, reglinks, trigger_time=None):
+        """
+        Saves new RegLinks with their invite and reminder Schedulers in a
+        few statements. The earlier links for the same email, role, suborg
+        and year are deleted, like `RegLink.save` does for a single link.
+        """
+        invites = {}
+        for reglink in reglinks:
+            validate_email(reglink.email)
+            key = (reglink.email, reglink.user_role, reglink.user_suborg_id, reglink.gsoc_year_id)
+            invites[key] = reglink
+        reglinks = list(invites.values())
+        if not reglinks:
+            return []
+
+        suborgs = SubOrg.objects.in_bulk({reglink.user_suborg_id for reglink in reglinks})
+        end_date = None
+        if any(reglink.gsoc_end_date is None for reglink in reglinks):
+            end_date = GsocEndDateDefault.objects.order_by("-id").values_list("date", flat=True).first()
+        for reglink in reglinks:
+            reglink.user_suborg = suborgs.get(reglink.user_suborg_id)
+            reglink.gsoc_end_date = reglink.gsoc_end_date or end_date
+
+        with transaction.atomic():
+            replaced = self.filter(email__in={reglink.email for reglink in reglinks}).values_list(
+                "email", "user_role", "user_suborg_id", "gsoc_year_id", "pk", "scheduler_id", "reminder_id"
+                )
+            replaced = [row[4:] for row in replaced if row[:4] in invites]
+            if replaced:
+                pks, scheduler_ids, reminder_ids = zip(*replaced)
+                Scheduler.objects.filter(pk__in=scheduler_ids + reminder_ids).delete()
+                self.filter(pk__in=pks).delete()
+
+            reglinks = bulk_create_with_pks(RegLink, reglinks, "reglink_id")
+
+            notified = [reglink for reglink in reglinks if reglink.send_notifications]
+            for reglink in notified:
+                reglink.scheduler = reglink.build_invite_scheduler(trigger_time)
+                reglink.reminder = reglink.build_reminder_scheduler(
+                    reglink.scheduler.activation_date + datetime.timedelta(days=REGLINK_REMINDER.days)
+                    )
+            bulk_create_with_pks(
+                Scheduler,
+                [s for reglink in notified for s in (reglink.scheduler, reglink.reminder)],
+                )
+            for reglink in notified:
+                reglink.scheduler_id, reglink.reminder_id = reglink.scheduler.pk, reglink.reminder.pk
+            self.bulk_update(notified, ["scheduler", "reminder"])
+        return reglinks
+
+
 class RegLink(models.Model):
     is_used = models.BooleanField(default=False, editable=False)
     reglink_id = models.CharField(
@@ -1238,6 +1524,8 @@ class RegLink(models.Model):
         )
     send_notifications = models.BooleanField(default=True)
 
+    objects = RegLinkManager()
+
     @property
     def has_scheduler(self):
         return self.scheduler is not None
@@ -1350,25 +1638,28 @@ class RegLink(models.Model):
         mark_urlconf_as_changed()
         return user
 
-    def create_scheduler(self, trigger_time=timezone.now()):
+    def build_invite_scheduler(self, trigger_time=None):
+        """
+        Returns the unsaved Scheduler sending the invite.
+        """
         validate_email(self.email)
         role = {0: "Others", 1: "Suborg Admin", 2: "Mentor", 3: "Student"}
         template_data = {
             "register_link": settings.INETLOCATION + self.url,
             "role": self.user_role,
-            "gsoc_year": self.gsoc_year.gsoc_year,
+            "gsoc_year": self.gsoc_year_id,
             }
         if self.user_role == 0:
             subject = (
                 f"You have been invited to join for GSoC "
-                f"{self.gsoc_year.gsoc_year} with PSF"
+                f"{self.gsoc_year_id} with PSF"
                 )
         else:
             subject = (
                 f"You have been invited to join "
                 f"{self.user_suborg.suborg_name.strip()}"
                 f" as a {role[self.user_role]} for GSoC "
-                f"{self.gsoc_year.gsoc_year} with PSF"
+                f"{self.gsoc_year_id} with PSF"
                 )
             template_data["suborg"] = self.user_suborg.suborg_name.strip()
         scheduler_data = build_send_mail_json(
@@ -1377,26 +1668,39 @@ class RegLink(models.Model):
             subject=subject,
             template_data=template_data,
             )
-        s = Scheduler.objects.create(
+        return Scheduler(
             command="send_email",
-            activation_date=trigger_time,
+            activation_date=trigger_time or timezone.now(),
             data=scheduler_data
             )
+
+    def build_reminder_scheduler(self, activation_date):
+        """
+        Returns the unsaved Scheduler sending the registration reminder.
+        """
+        validate_email(self.email)
+        register_link = settings.INETLOCATION + self.url
+        scheduler_data = build_send_reminder_json(
+            self.email,
+            self.pk,
+            template="registration_reminder.html",
+            subject="Reminder for registration",
+            template_data={"register_link": register_link},
+            )
+        return Scheduler(
+            command="send_reg_reminder",
+            activation_date=activation_date,
+            data=scheduler_data,
+            )
+
+    def create_scheduler(self, trigger_time=None):
+        s = self.build_invite_scheduler(trigger_time)
+        s.save()
         self.scheduler = s
         self.save()
 
     def create_reminder(self, trigger_time=None):
         if self.has_scheduler:
-            validate_email(self.email)
-            register_link = settings.INETLOCATION + self.url
-            scheduler_data = build_send_reminder_json(
-                self.email,
-                self.pk,
-                template="registration_reminder.html",
-                subject="Reminder for registration",
-                template_data={"register_link": register_link},
-                )
-
             if not trigger_time:
                 activation_date = self.scheduler.activation_date + datetime.timedelta(
                     days=REGLINK_REMINDER.days
@@ -1404,11 +1708,8 @@ class RegLink(models.Model):
             else:
                 activation_date = trigger_time
 
-            s = Scheduler.objects.create(
-                command="send_reg_reminder",
-                activation_date=activation_date,
-                data=scheduler_data,
-                )
+            s = self.build_reminder_scheduler(activation_date)
+            s.save()
             self.reminder = s
             self.save()
         else:
@@ -1443,8 +1744,13 @@ class Comment(models.Model):
         )
     created_at = models.DateTimeField(auto_now_add=True)
 
-    def send_notifications(self):
-        article_link = self.article.get_absolute_url()
+    def build_notifications(self, article_link=None):
+        """
+        Returns the unsaved `send_email` schedulers notifying the article
+        owner and the parent comment's author.
+        """
+        if article_link is None:
+            article_link = self.article.get_absolute_url()
         comment_link = "{}#comment-{}".format(article_link, self.pk)
         template_data = {
             "article": self.article.title,
@@ -1459,7 +1765,7 @@ class Comment(models.Model):
             subject="{} commented on your article".format(self.username),
             template_data=template_data,
             )
-        Scheduler.objects.create(command="send_email", data=scheduler_data)
+        notifications = [Scheduler(command="send_email", data=scheduler_data)]
 
         if self.parent and self.parent.user:
             template_data["parent_comment_owner"] = self.parent.username
@@ -1469,7 +1775,31 @@ class Comment(models.Model):
                 subject="{} replied to your comment".format(self.username),
                 template_data=template_data,
                 )
-            Scheduler.objects.create(command="send_email", data=scheduler_data)
+            notifications.append(Scheduler(command="send_email", data=scheduler_data))
+        return notifications
+
+    def send_notifications(self):
+        Scheduler.objects.bulk_create(self.build_notifications())
+
+
+class ArticleReviewQuerySet(models.QuerySet):
+    def published_in_year(self, year):
+        # a range on publishing_date can use an index, unlike matching the year as text
+        start, end = GsocYear(gsoc_year=year).get_bounds()
+        return self.filter(
+            article__publishing_date__gte=start, article__publishing_date__lt=end
+            )
+
+    def mark_reviewed(self, reviewer):
+        """
+        Marks the pending reviews as reviewed by `reviewer` in a single
+        UPDATE, returns the number of reviews changed.
+        """
+        if not reviewer.is_superuser:
+            raise ValidationError("The user does not have permissions to review an article.")
+        return self.filter(is_reviewed=False).update(
+            is_reviewed=True, last_reviewed_by=reviewer
+            )
 
 
 class ArticleReview(models.Model):
@@ -1483,6 +1813,8 @@ class ArticleReview(models.Model):
         )
     is_reviewed = models.BooleanField(default=False)
 
+    objects = ArticleReviewQuerySet.as_manager()
+
     def save(self, *args, **kwargs):
         if self.last_reviewed_by:
             if not self.last_reviewed_by.is_superuser:
@@ -1500,6 +1832,8 @@ class SendEmail(models.Model):
         ("admins", "Admins"),
         ("all", "All"),
         )
+    # None selects every role
+    group_roles = {"students": 3, "mentors": 2, "suborg_admins": 1, "all": None}
 
     to = models.CharField(
         null=True,
@@ -1515,50 +1849,59 @@ class SendEmail(models.Model):
     subject = models.CharField(max_length=255)
     body = models.TextField()
     activation_date = models.DateTimeField(blank=True, null=True)
-    scheduler = models.ForeignKey(
-        Scheduler, blank=True, null=True, on_delete=models.CASCADE
-        )
+    schedulers = models.ManyToManyField(Scheduler, blank=True, related_name="send_emails")
+
+    def get_group_emails(self):
+        """
+        Returns the addresses of `to_group`, resolved in the database.
+        """
+        if self.to_group == "admins":
+            emails = User.objects.filter(is_superuser=True).values_list("email", flat=True)
+        elif self.to_group in self.group_roles:
+            profiles = UserProfile.objects.filter(gsoc_year=GsocYear.objects.get_current())
+            if self.group_roles[self.to_group]:
+                profiles = profiles.filter(role=self.group_roles[self.to_group])
+            emails = profiles.values_list("user__email", flat=True)
+        else:
+            return []
+        return [email for email in emails.distinct() if email]
+
+    def get_recipients(self):
+        emails = [email.strip() for email in (self.to or "").split(",")]
+        emails.extend(self.get_group_emails())
+        # keeps the first occurrence of each address
+        return list(dict.fromkeys(email for email in emails if email))
+
+    def build_schedulers(self):
+        """
+        Returns one unsaved Scheduler per `SEND_EMAIL_CHUNK_SIZE` recipients.
+        """
+        recipients = self.get_recipients()
+        size = settings.SEND_EMAIL_CHUNK_SIZE
+        return [
+            Scheduler(
+                command="send_email",
+                data=build_send_mail_json(
+                    recipients[i:i + size],
+                    template="generic_email.html",
+                    subject=self.subject,
+                    template_data={"body": self.body},
+                    ),
+                activation_date=self.activation_date,
+                )
+            for i in range(0, len(recipients), size)
+            ]
 
     def save(self, *args, **kwargs):
         if not (self.to or self.to_group):
             raise ValidationError(
                 message="Any one of the fields 'to' or 'to_group' should be filled."
                 )
-        emails = []
-        if self.to:
-            emails.extend(self.to.split(","))
-
-        gsoc_year = GsocYear.objects.first()
-
-        if self.to_group == "students":
-            ups = UserProfile.objects.filter(role=3, gsoc_year=gsoc_year).all()
-            emails.extend([_.user.email for _ in ups])
-        elif self.to_group == "mentors":
-            ups = UserProfile.objects.filter(role=2, gsoc_year=gsoc_year).all()
-            emails.extend([_.user.email for _ in ups])
-        elif self.to_group == "suborg_admins":
-            ups = UserProfile.objects.filter(role=1, gsoc_year=gsoc_year).all()
-            emails.extend([_.user.email for _ in ups])
-        elif self.to_group == "admins":
-            ups = User.objects.filter(is_superuser=True)
-            emails.extend([_.user.email for _ in ups])
-        elif self.to_group == "all":
-            ups = UserProfile.objects.filter(gsoc_year=gsoc_year).all()
-            emails.extend([_.user.email for _ in ups])
-
-        scheduler_data = build_send_mail_json(
-            emails,
-            template="generic_email.html",
-            subject=self.subject,
-            template_data={"body": self.body},
-            )
-        self.scheduler = Scheduler.objects.create(
-            command="send_email",
-            data=scheduler_data,
-            activation_date=self.activation_date,
-            )
-
-        super(SendEmail, self).save(*args, **kwargs)
+        schedulers = self.build_schedulers()
+        with transaction.atomic():
+            super(SendEmail, self).save(*args, **kwargs)
+            schedulers = bulk_create_with_pks(Scheduler, schedulers)
+            self.schedulers.set(schedulers)
 
 
 class NotAcceptedUser(RegLink):
@@ -1568,6 +1911,13 @@ class NotAcceptedUser(RegLink):
 
 # Receivers
 
+# Drop the cached years when a GsocYear is added or removed
+@receiver(models.signals.post_save, sender=GsocYear)
+@receiver(models.signals.post_delete, sender=GsocYear)
+def invalidate_gsoc_years(sender, **kwargs):
+    cache.delete(GSOC_YEARS_CACHE_KEY)
+
+
 # Update blog count when new UserProfile is created
 @receiver(models.signals.pre_save, sender=UserProfile)
 def update_blog_counter(sender, instance, **kwargs):
@@ -1753,44 +2103,81 @@ def create_send_reg_reminder_schedulers(sender, instance, **kwargs):
         instance.create_reminder()
 
 
-# Add Send Comment Notification
+# Defer the notifications of a new comment to runcron
 @receiver(models.signals.post_save, sender=Comment)
-def send_comment_notification(sender, instance, **kwargs):
-    instance.send_notifications()
-
-
-# Decrease Blog Counter when new Article is created
-@receiver(models.signals.pre_save, sender=Article)
-def decrease_blog_counter(sender, instance, **kwargs):
-    if not instance.pk:
-        section = instance.app_config
-        try:
-            up = UserProfile.objects.get(app_config=section)
-            if up.current_blog_count > 0:
-                up.current_blog_count -= 1
-                print("Decreasing", up.current_blog_count)
-                up.save()
-        except Exception:
-            pass
+def send_comment_notification(sender, instance, created, **kwargs):
+    if created:
+        Scheduler.objects.create(
+            command="send_comment_notification",
+            data=json.dumps({"comment_id": instance.pk}),
+            )
 
 
-# Add ArticleReveiw object when new Article is created
+# Reset the review, record the history and decrease the blog counter of a saved Article
 @receiver(models.signals.post_save, sender=Article)
-def add_review(sender, instance, **kwargs):
-    ar = ArticleReview.objects.filter(article=instance).all()
-    if not ar:
+def update_article_records(sender, instance, created, **kwargs):
+    if created:
+        ArticleReview.objects.create(article=instance)
+        UserProfile.objects.filter(
+            app_config=instance.app_config, current_blog_count__gt=0
+            ).update(current_blog_count=F("current_blog_count") - 1)
+    elif not ArticleReview.objects.filter(article=instance).update(is_reviewed=False):
         ArticleReview.objects.create(article=instance)
 
-    if ar:
-        ar = ar.first()
-        ar.is_reviewed = False
-        ar.save()
+    BlogPostHistory.record(instance)
 
 
-# Add BlogPostHistory object when new Article is created
+# Drop the cached feed, sitemap and pages of the blog when one of its articles changes
 @receiver(models.signals.post_save, sender=Article)
-def add_history(sender, instance, **kwargs):
-    BlogPostHistory.objects.create(article=instance, content=instance.lead_in)
+@receiver(models.signals.post_delete, sender=Article)
+def invalidate_blog_feed(sender, instance, **kwargs):
+    invalidate_articles_feed(instance.app_config.namespace)
+    invalidate_blog_sitemap(instance.app_config.namespace)
+    invalidate_blog_pages(instance.app_config.namespace)
+
+
+# Drop the cached pages of the blog when a comment is added or removed
+@receiver(models.signals.post_save, sender=Comment)
+@receiver(models.signals.post_delete, sender=Comment)
+def invalidate_comment_blog_pages(sender, instance, **kwargs):
+    invalidate_blog_pages(instance.article.app_config.namespace)
+
+
+# Drop the rendered comment thread of the article when a comment is added or removed
+@receiver(models.signals.post_save, sender=Comment)
+@receiver(models.signals.post_delete, sender=Comment)
+def invalidate_article_comment_thread(sender, instance, **kwargs):
+    invalidate_comment_thread(instance.article_id)
+
+
+# Drop the cached pages of the blogs whose article content plugins were edited
+@receiver(post_placeholder_operation)
+def invalidate_article_content_blog_pages(sender, **kwargs):
+    placeholders = [_ for _ in kwargs.values() if isinstance(_, Placeholder)]
+    namespaces = (
+        Article.objects.filter(content__in=placeholders)
+        .order_by()
+        .values_list("app_config__namespace", flat=True)
+        .distinct()
+        )
+    for namespace in namespaces:
+        invalidate_blog_pages(namespace)
+
+
+# Drop cached blog lookups when a blog or its page changes
+@receiver(post_publish, sender=Page)
+@receiver(post_unpublish, sender=Page)
+@receiver(models.signals.post_save, sender=NewsBlogConfig)
+@receiver(models.signals.post_delete, sender=NewsBlogConfig)
+def invalidate_blog_lookups(sender, instance, **kwargs):
+    invalidate_blogs()
+
+
+# Drop the cached blog directory of the year when a profile changes
+@receiver(models.signals.post_save, sender=UserProfile)
+@receiver(models.signals.post_delete, sender=UserProfile)
+def invalidate_profile_blog_directory(sender, instance, **kwargs):
+    invalidate_blog_directory(instance.gsoc_year_id)
 
 
 # Delete add_blog_counter scheduler when BlopPostDueDate object is deleted
@@ -99,6 +99,7 @@ MIDDLEWARE = [
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "gsoc.middleware.GsocIdentityMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -107,6 +108,7 @@ MIDDLEWARE = [
     "cms.middleware.page.CurrentPageMiddleware",
     "cms.middleware.toolbar.ToolbarMiddleware",
     "cms.middleware.language.LanguageCookieMiddleware",
+    "gsoc.middleware.BlogPageCacheMiddleware",
     "django.middleware.cache.FetchFromCacheMiddleware",
     ]
 
@@ -325,6 +327,23 @@ logging.config.dictConfig(LOGGING)
 RUNCRON_NUM_WORKERS = 5
 RUNCRON_TIMEOUT = 10
 
+# proposals are scanned for private data in background threads, reading
+# at most this many pages or for this many seconds
+PROPOSAL_SCAN_WORKERS = 2
+PROPOSAL_SCAN_MAX_PAGES = 50
+PROPOSAL_SCAN_TIME_BUDGET = 30
+
+# recipients per message of a SendEmail broadcast, below the SMTP limits
+SEND_EMAIL_CHUNK_SIZE = 50
+
+# editor uploads are stored by content hash, images also get WebP renditions
+# at these widths built in background threads and served with a srcset
+UPLOAD_MAX_SIZE = 10 * 2 ** 20
+UPLOAD_IMAGE_WIDTHS = (480, 800, 1200, 1600)
+UPLOAD_WEBP_QUALITY = 80
+UPLOAD_RENDITION_WORKERS = 2
+CMS_PLUGIN_PROCESSORS = ("gsoc.common.utils.uploads.add_upload_srcset",)
+
 DJANGOCMS_AUDIO_ALLOWED_EXTENSIONS = ["mp3", "ogg", "wav"]
 DJANGOCMS_VIDEO_ALLOWED_EXTENSIONS = ["mp4", "webm", "ogv"]
 
@@ -490,6 +509,8 @@ BLEACH_ALLOWED_ATTRS = {
     "*": ["class", "style"],
     }
 
+BLEACH_ALLOWED_IFRAME_SRC = ["https://www.youtube.com/embed/"]
+
 BLEACH_ALLOWED_STYLES = [
     "background",
     "background-attachment",
@@ -565,6 +586,15 @@ BLEACH_ALLOWED_STYLES = [
     "z-index",
     ]
 
+# reCAPTCHA verification of new comments, set RECAPTCHA_VERIFIER to
+# "gsoc.common.utils.recaptcha.FakeRecaptchaVerifier" to verify locally
+RECAPTCHA_VERIFIER = "gsoc.common.utils.recaptcha.RecaptchaVerifier"
+# (connect, read) timeouts in seconds
+RECAPTCHA_TIMEOUT = (2, 3)
+# consecutive failures that open the circuit breaker, and seconds it stays open
+RECAPTCHA_FAILURE_THRESHOLD = 5
+RECAPTCHA_RECOVERY_TIMEOUT = 30
+
 SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
 
 CACHES = {
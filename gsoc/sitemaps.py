@@ -1,35 +1,157 @@
-import urllib.parse
-
-from django.contrib.sitemaps import Sitemap
 from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max, OuterRef, Q, Subquery
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.html import escape
+from django.utils.timezone import now
 
 from aldryn_newsblog.cms_appconfig import NewsBlogConfig
 from aldryn_newsblog.models import Article
 
-from cms.models import Page
-
-
-class BlogListSitemap(Sitemap):
-    priority = 0.5
-    protocol = "https"
-
-    def items(self):
-        urls = ["/"]
-        blogs = NewsBlogConfig.objects.all()
-        for blog in blogs:
-            try:
-                p = Page.objects.get(
-                    application_namespace=blog.namespace, publisher_is_draft=False
-                    )
-                urls.append(p.get_absolute_url())
-                articles = Article.objects.filter(app_config=blog, is_published=True).all()
-                for i in range((len(articles)-1) // 5):
-                    urls.append(f"{p.get_absolute_url()}?page={i + 2}")
-                for article in articles:
-                    urls.append(f"{p.get_absolute_url()}{article.slug}/")
-            except Exception as e:
-                continue
-        return urls
-
-    def location(self, obj):
-        return obj
+from cms.models import Title
+
+from gsoc.common.utils.blogs import (
+    BLOGS_CACHE_TIMEOUT,
+    blog_sitemap_cache_key,
+    get_blog_by_namespace,
+    )
+
+
+SITEMAP_CONTENT_TYPE = "application/xml; charset=utf-8"
+SITEMAP_PAGES_SECTION = "pages"
+
+INDEX_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    )
+INDEX_FOOTER = "</sitemapindex>\n"
+URLSET_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    )
+URLSET_FOOTER = "</urlset>\n"
+
+
+def sitemap_entry(tag, loc, lastmod=None, priority=None):
+    entry = f"<{tag}><loc>{escape(settings.INETLOCATION + loc)}</loc>"
+    if lastmod:
+        entry += f"<lastmod>{lastmod.date().isoformat()}</lastmod>"
+    if priority:
+        entry += f"<priority>{priority}</priority>"
+    return entry + f"</{tag}>\n"
+
+
+def page_path_subquery(namespace_ref, language):
+    return Title.objects.filter(
+        page__application_namespace=namespace_ref,
+        page__publisher_is_draft=False,
+        language=language,
+        ).values("path")[:1]
+
+
+def render_index(language):
+    """
+    Lists one child sitemap per published blog,
+    with the date of its newest article as lastmod.
+    """
+    blogs = (
+        NewsBlogConfig.objects.annotate(
+            blog_path=Subquery(page_path_subquery(OuterRef("namespace"), language)),
+            lastmod=Max(
+                "article__publishing_date",
+                filter=Q(
+                    article__is_published=True,
+                    article__publishing_date__lte=now(),
+                    ),
+                ),
+            )
+        .filter(blog_path__isnull=False)
+        .order_by("namespace")
+        .values_list("namespace", "lastmod")
+        )
+    chunks = [INDEX_HEADER, sitemap_entry("sitemap", f"/sitemap-{SITEMAP_PAGES_SECTION}.xml")]
+    for namespace, lastmod in blogs.iterator():
+        chunks.append(sitemap_entry("sitemap", f"/sitemap-{namespace}.xml", lastmod))
+    chunks.append(INDEX_FOOTER)
+    return "".join(chunks)
+
+
+def get_blog_page(namespace, language):
+    """
+    Returns the url and page size of a published blog.
+    """
+    blog = get_blog_by_namespace(namespace, language)
+    if blog is None:
+        raise Http404("No sitemap available for this section.")
+    paginate_by = (
+        NewsBlogConfig.objects.filter(namespace=namespace)
+        .values_list("paginate_by", flat=True)
+        .first()
+        )
+    return blog.url, paginate_by or 5
+
+
+def generate_blog_urls(namespace, blog_url, paginate_by, language):
+    """
+    Yields the sitemap of one blog: its articles, the blog page
+    and the blog's pagination pages.
+    """
+    articles = (
+        Article.objects.published()
+        .filter(app_config__namespace=namespace, translations__language_code=language)
+        .order_by("-publishing_date")
+        .values_list("translations__slug", "publishing_date")
+        )
+    yield URLSET_HEADER
+    count = 0
+    newest = None
+    for slug, publishing_date in articles.iterator():
+        newest = newest or publishing_date
+        count += 1
+        yield sitemap_entry("url", f"{blog_url}{slug}/", publishing_date, 0.5)
+    yield sitemap_entry("url", blog_url, newest, 0.5)
+    for page in range(2, (count - 1) // paginate_by + 2):
+        yield sitemap_entry("url", f"{blog_url}?page={page}", newest, 0.5)
+    yield URLSET_FOOTER
+
+
+def generate_pages_urls():
+    yield URLSET_HEADER
+    yield sitemap_entry("url", "/", priority=0.5)
+    yield URLSET_FOOTER
+
+
+def cache_chunks(key, chunks):
+    """
+    Passes the chunks through and caches them once all were generated.
+    """
+    content = []
+    for chunk in chunks:
+        content.append(chunk)
+        yield chunk
+    cache.set(key, "".join(content), BLOGS_CACHE_TIMEOUT)
+
+
+def index(request):
+    language = settings.LANGUAGE_CODE
+    key = blog_sitemap_cache_key("index", language)
+    content = cache.get(key)
+    if content is None:
+        content = render_index(language)
+        cache.set(key, content, BLOGS_CACHE_TIMEOUT)
+    return HttpResponse(content, content_type=SITEMAP_CONTENT_TYPE)
+
+
+def section(request, section):
+    language = settings.LANGUAGE_CODE
+    key = blog_sitemap_cache_key(section, language)
+    content = cache.get(key)
+    if content is not None:
+        return HttpResponse(content, content_type=SITEMAP_CONTENT_TYPE)
+
+    if section == SITEMAP_PAGES_SECTION:
+        chunks = generate_pages_urls()
+    else:
+        blog_url, paginate_by = get_blog_page(section, language)
+        chunks = generate_blog_urls(section, blog_url, paginate_by, language)
+    return StreamingHttpResponse(cache_chunks(key, chunks), content_type=SITEMAP_CONTENT_TYPE)
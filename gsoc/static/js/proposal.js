@@ -103,26 +103,51 @@ function uploadProposal() {
         setProposalUploadingStatus(false);
         return;
       }
-      const privateData = resp.data.private_data;
-      if(privateData.emails.length > 0 ||
-      privateData.possible_phone_numbers.length > 0 ||
-      privateData.locations.length > 0) {
-        let confirmText = "We seemed to have found private data in your pdf file. WE DO NOT RECOMEND UPLOADING A PDF WITH PHONE NUMBERS, PHYSICAL ADDRESS, OR EMAIL ADDRESSES AS THIS WILL BE SHOWN PUBLICALLY ON THE INTERNET. Are you sure to proceed?";
-        if (privateData.emails.length > 0)
-        confirmText += `<br> Email addresses: ${privateData.emails.toString()}`;
-        if(privateData.possible_phone_numbers.length > 0)
-        confirmText += `<br> Possible phone numbers: ${privateData.possible_phone_numbers.toString()}`;
-        if(privateData.locations.length > 0)
-        confirmText += `<br> Locations: ${privateData.locations.toString()}`;
-        onFindPrivateData(confirmText);
+      if(!resp.data.scan_id) {
+        inPageInfo("Your proposal could not be saved. Please try again!");
+        setProposalUploadingStatus(false);
         return;
       }
-      axios.get('/confirm_proposal');
+      pollProposalScan(resp.data.scan_id);
+    })
+    .catch(function(err) {
       setProposalUploadingStatus(false);
-      inPageInfo('Proposal upload succeeded! Please refresh to get rid of the GIANT banner!', false);
+      console.log(err);
+    });
+}
+function pollProposalScan(scanId) {
+  axios.get(`/proposal-scan/${scanId}/`)
+    .then(function(resp) {
+      if(resp.data.status === 'pending') {
+        setTimeout(function() { pollProposalScan(resp.data.scan_id); }, 2000);
+        return;
+      }
+      if(resp.data.status === 'failed') {
+        onFindPrivateData("We could not check your pdf file for private data. PLEASE MAKE SURE IT HAS NO PHONE NUMBERS, PHYSICAL ADDRESS, OR EMAIL ADDRESSES AS THIS WILL BE SHOWN PUBLICALLY ON THE INTERNET. Are you sure to proceed?");
+        return;
+      }
+      onProposalScanned(resp.data.private_data);
     })
     .catch(function(err) {
       setProposalUploadingStatus(false);
       console.log(err);
     });
 }
+function onProposalScanned(privateData) {
+  if(privateData.emails.length > 0 ||
+  privateData.possible_phone_numbers.length > 0 ||
+  privateData.locations.length > 0) {
+    let confirmText = "We seemed to have found private data in your pdf file. WE DO NOT RECOMEND UPLOADING A PDF WITH PHONE NUMBERS, PHYSICAL ADDRESS, OR EMAIL ADDRESSES AS THIS WILL BE SHOWN PUBLICALLY ON THE INTERNET. Are you sure to proceed?";
+    if (privateData.emails.length > 0)
+    confirmText += `<br> Email addresses: ${privateData.emails.toString()}`;
+    if(privateData.possible_phone_numbers.length > 0)
+    confirmText += `<br> Possible phone numbers: ${privateData.possible_phone_numbers.toString()}`;
+    if(privateData.locations.length > 0)
+    confirmText += `<br> Locations: ${privateData.locations.toString()}`;
+    onFindPrivateData(confirmText);
+    return;
+  }
+  axios.get('/confirm_proposal');
+  setProposalUploadingStatus(false);
+  inPageInfo('Proposal upload succeeded! Please refresh to get rid of the GIANT banner!', false);
+}
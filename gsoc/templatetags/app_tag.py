@@ -2,39 +2,32 @@ from django import template
 import datetime
 import django.utils.timezone as tz
 import pytz
+from django.utils.safestring import mark_safe
+
+from gsoc.common.utils.comments import render_comment_thread
+from gsoc.common.utils.time_zones import time_zone_index
 
 register = template.Library()
 
 """
     This function makes use of the django timezone library to
     get the user's local time and pytz for getting utc time.
-    Now, we use the common_timezones library in pytz to get
-    timezone of various places across the globe.
 
-    We calculate the difference between Utctime and localtime and compare
-    the difference of utctime with those global timezones with
-    previously computed difference and accordingly, set the
-    timezone of the user.
+    We calculate the difference between utctime and localtime and look it up
+    in an index of the current offsets of the common_timezones in pytz, see
+    `TimeZoneIndex`, to set the timezone of the user.
 """
 
 
 @register.simple_tag(takes_context=True)
 def time_zone(context, flag=0):
-    gmtTime = "+00:00"
+    utcTime = datetime.datetime.now(tz=pytz.utc)
     localTime = tz.now()
-    utcTimeZone = pytz.timezone("UTC")
-    utcTime = datetime.datetime.now(tz=utcTimeZone)
-    all_timezones = pytz.common_timezones
-    TIME_ZONE = "UTC"
-    for i in all_timezones:
-        timeZone = pytz.timezone(i)
-        timeFromUTC = str(datetime.datetime.now(tz=timeZone))[-6:]
-        time = datetime.datetime.now(tz=timeZone)
-        if time.hour == localTime.hour:
-            if abs(time.minute - localTime.minute) <= 1:
-                TIME_ZONE = i
-                gmtTime = timeFromUTC
-                break
+    if tz.is_aware(localTime):
+        localTime = tz.localtime(localTime)
+    offset = localTime.replace(tzinfo=None) - utcTime.replace(tzinfo=None)
+    match = time_zone_index.lookup(round(offset.total_seconds() / 60), utcTime)
+    TIME_ZONE, gmtTime = match or ("UTC", "+00:00")
     if flag:
         return gmtTime
     else:
@@ -44,3 +37,15 @@ def time_zone(context, flag=0):
 @register.filter
 def get_author(value):
     return value[0].owner.id
+
+
+@register.simple_tag(takes_context=True)
+def comment_thread(context, article):
+    """
+    Renders the comments of an article, see `render_comment_thread`.
+    """
+    return mark_safe(
+        render_comment_thread(
+            article, context["request"].user, str(context.get("csrf_token", ""))
+            )
+        )
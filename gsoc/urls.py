@@ -8,7 +8,6 @@ from django.urls import include, path
 from django.conf.urls import url
 from django.conf.urls.i18n import i18n_patterns
 from django.contrib import admin
-from django.contrib.sitemaps.views import sitemap
 from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 from django.views.static import serve
 from django.urls import path
@@ -21,10 +20,11 @@ import gsoc.sitemaps as sitemaps
 admin.autodiscover()
 
 urlpatterns = [
+    url(r"^sitemap\.xml$", sitemaps.index, name="sitemap"),
     url(
-        r"^sitemap.xml",
-        sitemap,
-        {"sitemaps": {"blog_sitemaps": sitemaps.BlogListSitemap}},
+        r"^sitemap-(?P<section>[\w-]+)\.xml$",
+        sitemaps.section,
+        name="sitemap_section",
         ),
     url(
         r"^robots.txt",
@@ -74,6 +74,11 @@ if settings.DEBUG:
 urlpatterns += [
     url("after-login/", gsoc.views.after_login_view, name="after-login"),
     url("upload-proposal/", gsoc.views.upload_proposal_view, name="upload-proposal"),
+    url(
+        r"^proposal-scan/(?P<scan_id>[0-9a-f]{64})/$",
+        gsoc.views.proposal_scan_status_view,
+        name="proposal-scan",
+        ),
     url(
         "cancel_proposal_upload/",
         gsoc.views.cancel_proposal_upload_view,
@@ -119,6 +124,7 @@ urlpatterns += [url(r"^test/", gsoc.views.test, name="test")]
 
 # Export routes
 urlpatterns += [
+    url(r"^admin/export/(?P<kind>\w+)\.csv$", gsoc.views.export_csv, name="export_csv"),
     url("admin/export", gsoc.views.export_mentors, name="export_mentors"),
     url("export", gsoc.views.export_view, name="export_view")
     ]
@@ -1,5 +1,4 @@
 from django.http import HttpResponse
-import csv
 from datetime import datetime
 
 from gsoc import settings
@@ -7,7 +6,6 @@ from gsoc import settings
 from .forms import AcceptanceForm, ChangeInfoForm, ProposalUploadForm
 from .models import (
     RegLink,
-    ProposalTextValidator,
     Comment,
     ArticleReview,
     GsocYear,
@@ -15,10 +13,7 @@ from .models import (
     UserProfile,
     )
 
-import io
 import os
-import urllib
-import json
 import uuid
 
 from django.contrib import messages
@@ -26,9 +21,14 @@ from django.contrib.auth import decorators, password_validation, validators, log
 from django.contrib.auth.models import User
 from django.contrib.auth.forms import PasswordChangeForm
 from django import shortcuts
-from django.http import JsonResponse, HttpResponseRedirect
+from django.http import (
+    Http404,
+    HttpResponseBadRequest,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+    )
 from django.core.exceptions import ValidationError
-from django.core.cache import cache
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.conf import settings
@@ -38,12 +38,17 @@ from django.db import IntegrityError
 
 from aldryn_newsblog.models import Article
 
-from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
-from pdfminer.converter import TextConverter
-from pdfminer.layout import LAParams
-from pdfminer.pdfpage import PDFPage
-
-from profanityfilter import ProfanityFilter
+from gsoc.common.utils.exports import EXPORTS
+from gsoc.common.utils.profanity import profanity_filter
+from gsoc.common.utils.proposals import get_proposal_scan, start_proposal_scan
+from gsoc.common.utils.recaptcha import RecaptchaUnavailable, get_recaptcha_verifier
+from gsoc.common.utils.uploads import (
+    UploadTooLarge,
+    build_srcset,
+    media_url,
+    plan_renditions,
+    store_upload,
+    )
 
 import google_auth_oauthlib.flow
 
@@ -56,19 +61,21 @@ ROLES = {1: 'Admin', 2: 'Mentor', 3: 'Student'}
 
 @csrf_exempt
 def upload_file(request):
-    file = request.FILES["upload"]
-    filename = str(uuid.uuid4()) + "." + file.name.split(".")[-1]
-    filepath = os.path.join("media/uploads", filename)
-    fileurl = os.path.join("/", filepath)
-    abspath = os.path.join(settings.BASE_DIR, filepath)
-    if not os.path.exists(os.path.dirname(abspath)):
-        os.makedirs(os.path.dirname(abspath))
-
-    with open(abspath, "wb+") as destination:
-        for chunk in file.chunks():
-            destination.write(chunk)
+    file = request.FILES.get("upload")
+    if file is None:
+        return HttpResponseBadRequest()
+    try:
+        name, digest = store_upload(file)
+    except UploadTooLarge as err:
+        # CKEditor shows the message of a failed upload
+        return JsonResponse({"uploaded": 0, "error": {"message": str(err)}})
 
-    return JsonResponse({"uploaded": 1, "fileName": filename, "url": fileurl})
+    response = {"uploaded": 1, "fileName": os.path.basename(name), "url": media_url(name)}
+    renditions = plan_renditions(name, digest)
+    if renditions:
+        response["renditions"] = {w: media_url(rendition) for w, rendition in renditions.items()}
+        response["srcset"] = build_srcset(renditions)
+    return JsonResponse(response)
 
 
 # handle redirect to blogs
@@ -89,24 +96,6 @@ def redirect_articles(request, blog_name, article_name):
 # handle proposal upload
 
 
-def convert_pdf_to_txt(f):
-    rsrcmgr = PDFResourceManager()
-    retstr = io.StringIO()
-    laparams = LAParams()
-    device = TextConverter(rsrcmgr, retstr, codec="utf-8", laparams=None)
-    interpreter = PDFPageInterpreter(rsrcmgr, device)
-    pagenos = set()
-    for page in PDFPage.get_pages(
-            f, pagenos, maxpages=0, caching=True, check_extractable=True
-            ):
-        interpreter.process_page(page)
-    text = retstr.getvalue()
-    f.close()
-    device.close()
-    retstr.close()
-    return text
-
-
 def is_user_accepted_student(user):
     return user.is_current_year_student()
 
@@ -115,22 +104,6 @@ def is_superuser(user):
     return user.is_superuser
 
 
-def scan_proposal(file):
-    """
-    NOTE: returns True if not found private data.
-    """
-    try:
-        text = convert_pdf_to_txt(file)
-    except BaseException:
-        text = ""
-    try:
-        v = ProposalTextValidator()
-        v.validate(text)
-        return None
-    except ValidationError as err:
-        return err
-
-
 @decorators.login_required
 def after_login_view(request):
     user = request.user
@@ -158,12 +131,27 @@ def upload_proposal_view(request):
             form = ProposalUploadForm(request.POST, request.FILES, instance=profile)
             if form.is_valid():
                 form.save()
-                scan_result = scan_proposal(file)
-                if scan_result:
-                    resp["private_data"] = scan_result.message_dict
+                resp["scan_id"] = start_proposal_scan(profile.accepted_proposal_pdf)
     return JsonResponse(resp)
 
 
+@decorators.login_required
+@decorators.user_passes_test(is_user_accepted_student)
+def proposal_scan_status_view(request, scan_id):
+    """
+    Returns the state of a proposal scan, `done` comes with the private
+    data found. A lost scan of the current proposal is started again.
+    """
+    result = get_proposal_scan(scan_id)
+    if result is None:
+        profile = request.user.student_profile()
+        if not profile.accepted_proposal_pdf:
+            raise Http404("No proposal is being scanned.")
+        scan_id = start_proposal_scan(profile.accepted_proposal_pdf)
+        result = get_proposal_scan(scan_id) or {"status": "pending"}
+    return JsonResponse(dict(result, scan_id=scan_id))
+
+
 @decorators.login_required
 @decorators.user_passes_test(is_user_accepted_student)
 def cancel_proposal_upload_view(request):
@@ -184,7 +172,7 @@ def confirm_proposal_view(request):
 def new_account_view(request):
     if request.method == "POST":
         email = request.POST.get("email", None)
-        gsoc_year = GsocYear.objects.first()
+        gsoc_year = GsocYear.objects.get_current()
         if email:
             RegLink.objects.create(user_role=0, gsoc_year=gsoc_year, email=email)
             messages.success(
@@ -392,19 +380,18 @@ def new_comment(request):
 
         flag = True
         if not disable_recaptcha:
-            recaptcha_response = request.POST.get("g-recaptcha-response")
-            url = "https://www.google.com/recaptcha/api/siteverify"
-            payload = {
-                "secret": settings.RECAPTCHA_PRIVATE_KEY,
-                "response": recaptcha_response,
-                }
-            data = urllib.parse.urlencode(payload).encode()
-            req = urllib.request.Request(url, data=data)
-
-            response = urllib.request.urlopen(req)
-            result = json.loads(response.read().decode())
-
-            flag = result["success"]
+            try:
+                flag = get_recaptcha_verifier().verify(
+                    request.POST.get("g-recaptcha-response"),
+                    request.META.get("REMOTE_ADDR"),
+                    )
+            except RecaptchaUnavailable:
+                messages.add_message(
+                    request,
+                    messages.ERROR,
+                    "reCAPTCHA verification is unavailable right now, please try again later.",
+                    )
+                return redirect(request.POST.get("redirect") or "/")
 
         if flag:
             # if score greater than threshold allow to add
@@ -426,8 +413,7 @@ def new_comment(request):
                 user = None
                 username = request.POST.get("username")
 
-            pf = ProfanityFilter()
-            if pf.is_clean(comment) and pf.is_clean(username):
+            if profanity_filter.is_clean(comment) and profanity_filter.is_clean(username):
                 c = Comment(
                     username=username,
                     content=comment,
@@ -450,15 +436,6 @@ def new_comment(request):
 
         redirect_path = request.POST.get("redirect")
 
-        cache.clear()
-
-        # mem = MemcachedStats()
-        # keys = [_[3:] for _ in mem.keys()]
-        # for key in keys:
-        #     if 'cache_page' in key or 'cache_header' in key:
-        #         print(key, cache.get(key))
-        #         cache.delete(key)
-
         if redirect_path:
             return redirect(redirect_path)
         else:
@@ -568,32 +545,48 @@ def export_view(request):
             )
 
 
+def get_export_years(request):
+    """
+    Returns the years asked for with `year`, the current one by default
+    or None for `year=all`.
+    """
+    years = request.GET.getlist("year")
+    if "all" in years:
+        return None
+    if not years:
+        return [datetime.now().year]
+    return [int(year) for year in years]
+
+
 @decorators.login_required
 @decorators.user_passes_test(is_superuser)
-def export_mentors(request):
-    output = []
-    ROLES = {1: 'Suborg Admin', 2: 'Mentor'}
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="Mentors.csv"'
-    writer = csv.writer(response)
-    query_set = UserProfile.objects.filter(
-        gsoc_year=datetime.now().year,
-        role__in=[2, 1]
-        ).order_by("-id")
-
-    writer.writerow(['User', 'Email', 'Suborg', 'Role'])
-    for userprofile in query_set:
-        output.append([
-            userprofile.user,
-            userprofile.user.email,
-            userprofile.suborg_full_name,
-            ROLES.get(userprofile.role)
-            ])
-    writer.writerows(output)
-
+def export_csv(request, kind):
+    """
+    Streams an export as csv, `columns` picks comma separated columns.
+    """
+    export = EXPORTS.get(kind)
+    if export is None:
+        raise Http404("No such export.")
+    names = [name for name in request.GET.get("columns", "").split(",") if name]
+    try:
+        columns = export.get_columns(names)
+        years = get_export_years(request)
+    except KeyError as e:
+        return HttpResponseBadRequest(f"Unknown column {e}.")
+    except ValueError:
+        return HttpResponseBadRequest("Invalid year.")
+
+    response = StreamingHttpResponse(export.stream(columns, years), content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="{kind}.csv"'
     return response
 
 
+@decorators.login_required
+@decorators.user_passes_test(is_superuser)
+def export_mentors(request):
+    return export_csv(request, "mentors")
+
+
 def test(request):
     return HttpResponse("{}".format(request.META["REMOTE_ADDR"]))
 
@@ -650,23 +643,11 @@ def oauth2callback(request):
 @decorators.login_required
 @decorators.user_passes_test(is_superuser)
 def mark_all_article_as_reviewed(request, author_id):
-    user = User.objects.get(id=author_id)
-    current_year = datetime.now().year
-    articles = Article.objects.filter(
-        owner=user,
-        publishing_date__contains=current_year
+    reviewed = (
+        ArticleReview.objects.filter(article__owner_id=author_id)
+        .published_in_year(datetime.now().year)
+        .mark_reviewed(request.user)
         )
-    for article in articles:
-        try:
-            review = ArticleReview.objects.get(
-                article=article,
-                is_reviewed=False
-                )
-            review.is_reviewed = True
-            review.last_reviewed_by = request.user
-            review.save()
-        except Exception:
-            pass
 
-    messages.success(request, "All articles marked as reviewed!")
+    messages.success(request, "{} articles marked as reviewed!".format(reviewed))
     return HttpResponseRedirect(request.META.get('HTTP_REFERER'))
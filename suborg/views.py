@@ -33,11 +33,11 @@ def home(request):
 def application_list(request):
     applications = SubOrgDetails.objects.filter(suborg_admin=request.user)
     mentors_list = {}
+    gsoc_year = GsocYear.objects.get_current()
     for a in applications:
         if hasattr(a.suborg, 'id'):
             mentors_list[a.suborg.id] = UserProfile.objects.filter(
-                role=2, suborg_full_name=a.suborg.id, gsoc_year=GsocYear.objects.first())
-    gsoc_year = GsocYear.objects.first()
+                role=2, suborg_full_name=a.suborg.id, gsoc_year=gsoc_year)
     if len(applications) == 0:
         return redirect(reverse("suborg:register_suborg"))
 
@@ -47,7 +47,7 @@ def application_list(request):
 @decorators.login_required
 def register_suborg(request):
     email = request.user.email
-    gsoc_year = GsocYear.objects.first()
+    gsoc_year = GsocYear.objects.get_current()
 
     if request.method == "GET":
         form = SubOrgApplicationForm(
@@ -119,7 +119,7 @@ def post_register(request):
 def accept_application(request, application_id):
     if request.method == "GET":
         application = SubOrgDetails.objects.get(id=application_id)
-        gsoc_year = GsocYear.objects.get(gsoc_year=datetime.now().year)
+        gsoc_year = GsocYear.objects.get_by_year(datetime.now().year)
 
         try:
             suborg = SubOrg.objects.get(suborg_name=application.suborg_name)